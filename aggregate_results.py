@@ -1,107 +1,96 @@
 # aggregate_results.py
 import os
-import math
-import pandas as pd
+import csv
 import matplotlib.pyplot as plt
 
+from resultados_db import conectar, importar_csv, top_k_ga, mejor_lp, resumen_tiempos
+
 # ==== Config ====
 RESULTS_DIR = "results"
 GA_CSV = os.path.join(RESULTS_DIR, "ga_resultados.csv")
 LP_CSV = os.path.join(RESULTS_DIR, "lp_resultados.csv")
 OUT_CSV = os.path.join(RESULTS_DIR, "comparativo_ga_lp.csv")
+TOP_K = 3
 
 # Mapeo requerido por la rúbrica
 N_CIUDADES = {"eil101": 101, "gr229": 229, "inventado": 80}
 
-# ==== Cargas básicas ====
-assert os.path.exists(GA_CSV), f"No existe {GA_CSV}"
-assert os.path.exists(LP_CSV), f"No existe {LP_CSV}"
-
-ga = pd.read_csv(GA_CSV)
-lp = pd.read_csv(LP_CSV)
-
-# Normalizaciones de tipos
-for col in ["mejor_distancia", "tiempo_seg"]:
-    if col in ga.columns:
-        ga[col] = pd.to_numeric(ga[col], errors="coerce")
-
-for col in ["objetivo", "tiempo_seg"]:
-    if col in lp.columns:
-        lp[col] = pd.to_numeric(lp[col], errors="coerce")
-
-# ==== Top-3 GA por instancia ====
-ga_top = (
-    ga.sort_values(["instancia", "mejor_distancia"])
-      .groupby("instancia")
-      .head(3)
-      .reset_index(drop=True)
-)
-ga_top["rank"] = ga_top.groupby("instancia")["mejor_distancia"].rank(method="first").astype(int)
-ga_top["metodo"] = ga_top["rank"].map({1: "GA_top1", 2: "GA_top2", 3: "GA_top3"})
+# ==== Base de resultados ====
+db = conectar()
 
-# ==== LP mejor por instancia ====
-lp_best = (
-    lp.sort_values(["instancia", "objetivo"])
-      .groupby("instancia")
-      .head(1)
-      .reset_index(drop=True)
-)
-lp_best["metodo"] = "LP"
+# Migración: si la base está vacía, se siembra con los CSV existentes
+n_ga = db.execute("SELECT COUNT(*) FROM corridas").fetchone()[0]
+n_lp = db.execute("SELECT COUNT(*) FROM lp_solves").fetchone()[0]
+if n_ga == 0 and n_lp == 0:
+    ig, il = importar_csv(db, GA_CSV, LP_CSV)
+    print(f"Importé {ig} corridas GA y {il} solves LP desde CSV")
 
-# ==== Gap % de cada GA_top frente a LP ====
-lp_map = lp_best.set_index("instancia")["objetivo"].to_dict()
-def _gap(row):
-    inst = row["instancia"]
-    if inst not in lp_map or pd.isna(lp_map[inst]) or lp_map[inst] == 0:
-        return float("nan")
-    return 100.0 * (row["mejor_distancia"] - lp_map[inst]) / lp_map[inst]
-
-ga_top["gap_pct_vs_LP"] = ga_top.apply(_gap, axis=1)
+# ==== Top-k GA por instancia (+ gap % vs LP) y LP mejor, en SQL ====
+ga_top = top_k_ga(db, k=TOP_K)
+lp_best = mejor_lp(db)
+tiempos = resumen_tiempos(db)
 
 # ==== Armar tabla final con n_ciudades ====
-ga_out = ga_top[["instancia", "metodo", "mejor_distancia", "tiempo_seg", "n_poblacion", "n_iter", "gap_pct_vs_LP"]].rename(
-    columns={"mejor_distancia": "distancia", "tiempo_seg": "tiempo"}
-)
-ga_out.insert(1, "n_ciudades", ga_out["instancia"].map(N_CIUDADES))  # ← NUEVO
-
-lp_out = lp_best[["instancia", "metodo", "objetivo", "tiempo_seg", "n_vars", "n_constraints"]].rename(
-    columns={"objetivo": "distancia", "tiempo_seg": "tiempo"}
-)
-lp_out.insert(1, "n_ciudades", lp_out["instancia"].map(N_CIUDADES))  # ← NUEVO
-
-final = pd.concat([ga_out, lp_out], ignore_index=True)
-final.to_csv(OUT_CSV, index=False)
+cols = ["instancia", "n_ciudades", "metodo", "distancia", "tiempo",
+        "n_poblacion", "n_iter", "gap_pct_vs_LP", "n_vars", "n_constraints"]
+filas = []
+for r in ga_top:
+    filas.append({
+        "instancia": r["instancia"], "n_ciudades": N_CIUDADES.get(r["instancia"]),
+        "metodo": f"GA_top{r['rank']}", "distancia": r["mejor_distancia"], "tiempo": r["tiempo_seg"],
+        "n_poblacion": r["n_poblacion"], "n_iter": r["n_iter"], "gap_pct_vs_LP": r["gap_pct_vs_LP"],
+    })
+for r in lp_best:
+    filas.append({
+        "instancia": r["instancia"], "n_ciudades": N_CIUDADES.get(r["instancia"]),
+        "metodo": "LP", "distancia": r["objetivo"], "tiempo": r["tiempo_seg"],
+        "n_vars": r["n_vars"], "n_constraints": r["n_constraints"],
+    })
+
+with open(OUT_CSV, "w", newline="") as f:
+    w = csv.DictWriter(f, fieldnames=cols)
+    w.writeheader()
+    w.writerows(filas)
 print("Escribí", OUT_CSV)
 
 alertas = []
-for inst, sub in ga_top.groupby("instancia"):
-    lp_val = lp_map.get(inst, None)
-    if lp_val is None or pd.isna(lp_val):
-        continue
-    min_gap = sub["gap_pct_vs_LP"].min()
-    if pd.notna(min_gap) and min_gap < -5.0:
-        alertas.append(f"[AVISO] Gaps negativos grandes en {inst} (min {min_gap:.2f}%). "
+min_gap = {}
+for r in ga_top:
+    g = r["gap_pct_vs_LP"]
+    if g is not None:
+        min_gap[r["instancia"]] = min(g, min_gap.get(r["instancia"], g))
+for inst, g in min_gap.items():
+    if g < -5.0:
+        alertas.append(f"[AVISO] Gaps negativos grandes en {inst} (min {g:.2f}%). "
                        f"Verifica que el GA use la misma EDGE_WEIGHT_TYPE que LP (e.g., GEO en gr229).")
 if alertas:
     print("\n".join(alertas))
 
 # ==== Gráfica de tiempos: promedio GA vs LP ====
-ga_time_mean = ga.groupby("instancia")["tiempo_seg"].mean().rename("tiempo_ga_prom")
-lp_time = lp_best.set_index("instancia")["tiempo"].rename("tiempo_lp")
-merged = pd.concat([ga_time_mean, lp_time], axis=1)
-
-ax = merged.plot(kind="bar", figsize=(7, 4))
-ax.set_title("Tiempo promedio GA vs LP por instancia")
-ax.set_ylabel("segundos")
-plt.tight_layout()
-plt.savefig(os.path.join(RESULTS_DIR, "tiempos_ga_vs_lp.png"))
-plt.close()
+if tiempos:
+    insts = [r["instancia"] for r in tiempos]
+    xs = range(len(insts))
+    plt.figure(figsize=(7, 4))
+    plt.bar([x - 0.2 for x in xs], [r["tiempo_ga_prom"] or 0 for r in tiempos], width=0.4, label="tiempo_ga_prom")
+    plt.bar([x + 0.2 for x in xs], [r["tiempo_lp"] or 0 for r in tiempos], width=0.4, label="tiempo_lp")
+    plt.xticks(list(xs), insts, rotation=90)
+    plt.title("Tiempo promedio GA vs LP por instancia")
+    plt.ylabel("segundos")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(os.path.join(RESULTS_DIR, "tiempos_ga_vs_lp.png"))
+    plt.close()
 
 # ==== Gráfica de gaps: GA_top1 vs LP ====
-ga1 = ga_top[ga_top["metodo"] == "GA_top1"].set_index("instancia")
-ax = ga1["gap_pct_vs_LP"].plot(kind="bar", figsize=(7, 4))
-ax.set_title("Gap % GA_top1 vs LP por instancia")
-ax.set_ylabel("%")
-plt.tight_layout()
-plt.savefig(os.path.join(RESULTS_DIR, "gap_ga_top1_vs_lp.png"))
-plt.close()
+ga1 = [r for r in ga_top if r["rank"] == 1 and r["gap_pct_vs_LP"] is not None]
+if ga1:
+    plt.figure(figsize=(7, 4))
+    plt.bar([r["instancia"] for r in ga1], [r["gap_pct_vs_LP"] for r in ga1])
+    plt.xticks(rotation=90)
+    plt.title("Gap % GA_top1 vs LP por instancia")
+    plt.ylabel("%")
+    plt.tight_layout()
+    plt.savefig(os.path.join(RESULTS_DIR, "gap_ga_top1_vs_lp.png"))
+    plt.close()
+
+db.close()
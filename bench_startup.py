@@ -0,0 +1,45 @@
+# bench_startup.py
+"""
+Benchmark de arranque de la CLI: mide (en procesos nuevos) el costo de importar
+main.py, de `main.py --help` y de una corrida GA mínima sin gráficas, y reporta
+qué módulos pesados quedaron cargados al importar main.
+"""
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+PESADOS = ("matplotlib", "pulp", "pandas", "imageio")
+
+CASOS = {
+    "import main": [sys.executable, "-c", "import main"],
+    "main.py --help": [sys.executable, "main.py", "--help"],
+    "GA mínimo --json": [sys.executable, "main.py", "--metodo", "ga", "--instancia", "inventado",
+                         "--n_poblacion", "10", "--n_iter", "1", "--json", "-"],
+}
+
+
+def medir(cmd, reps):
+    tiempos = []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        tiempos.append(time.perf_counter() - t0)
+    return tiempos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de tiempo de arranque de main.py")
+    parser.add_argument("--reps", type=int, default=10)
+    args = parser.parse_args()
+
+    for nombre, cmd in CASOS.items():
+        ts = medir(cmd, args.reps)
+        print(f"{nombre:<20} min={min(ts)*1000:7.1f} ms  mediana={statistics.median(ts)*1000:7.1f} ms")
+
+    out = subprocess.run(
+        [sys.executable, "-c", f"import sys, main; print([m for m in {PESADOS!r} if m in sys.modules])"],
+        capture_output=True, text=True, check=True,
+    )
+    print("Módulos pesados cargados por `import main`:", out.stdout.strip())
@@ -0,0 +1,105 @@
+# comparar_cruces.py
+"""
+Compara tiempo-a-calidad de los operadores de cruce (OX, ERX, EAX) del GA sobre las
+instancias incluidas: con el mismo presupuesto de tiempo por corrida registra la mejor
+distancia en función del tiempo y el tiempo en alcanzar un gap dado contra la
+referencia (óptimo LP si existe, si no la mejor distancia encontrada).
+"""
+import os
+import csv
+import argparse
+
+from genetico import iter_genetico, CRUCES
+from tsplib import leer_tsplib, build_distance_matrix
+
+INSTANCIAS = {
+    "eil101": "data/eil101.tsp",
+    "gr229": "data/gr229.tsp",
+    "inventado": "data/inventado.tsp",
+}
+RESULTS_DIR = "results"
+LP_CSV = os.path.join(RESULTS_DIR, "lp_resultados.csv")
+GAPS = (20.0, 10.0, 5.0)   # % sobre la referencia
+
+
+def _referencias_lp():
+    ref = {}
+    if os.path.exists(LP_CSV):
+        with open(LP_CSV, newline="") as f:
+            for r in csv.DictReader(f):
+                if r.get("status") == "Optimal" and r.get("objetivo"):
+                    ref[r["instancia"]] = float(r["objetivo"])
+    return ref
+
+
+def correr(instancias, cruces, seeds, time_budget, n_poblacion):
+    trayectorias = {}   # (inst, cruce, seed) -> [(t, mejor)]
+    for nombre in instancias:
+        D = build_distance_matrix(leer_tsplib(INSTANCIAS[nombre]))
+        for cruce in cruces:
+            for seed in seeds:
+                tray = []
+                for e in iter_genetico(None, dist_matrix=D, n_poblacion=n_poblacion, n_iter=10**9,
+                                       porc_cruce=0.68, porc_mut=0.30, seed=seed,
+                                       time_limit=time_budget, crossover=cruce):
+                    tray.append((e["tiempo_total"], float(e["mejor_distancia"])))
+                trayectorias[(nombre, cruce, seed)] = tray
+                print(f"{nombre:<10} {cruce:<4} seed={seed}: {tray[-1][1]:.2f} en {len(tray)} gens")
+    return trayectorias
+
+
+def _tiempo_hasta(tray, objetivo):
+    for t, d in tray:
+        if d <= objetivo:
+            return t
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tiempo-a-calidad de OX vs ERX vs EAX")
+    parser.add_argument("--instancias", nargs="+", default=list(INSTANCIAS), choices=list(INSTANCIAS))
+    parser.add_argument("--cruces", nargs="+", default=list(CRUCES), choices=list(CRUCES))
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--time_budget", type=float, default=60.0, help="segundos por corrida")
+    parser.add_argument("--n_poblacion", type=int, default=100)
+    parser.add_argument("--no-plots", action="store_true")
+    args = parser.parse_args()
+
+    seeds = list(range(1, args.seeds + 1))
+    tray = correr(args.instancias, args.cruces, seeds, args.time_budget, args.n_poblacion)
+
+    lp_ref = _referencias_lp()
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    outcsv = os.path.join(RESULTS_DIR, "cruces_tiempo_calidad.csv")
+    with open(outcsv, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["instancia", "crossover", "seed", "referencia", "mejor_distancia", "gap_pct", "generaciones"]
+                   + [f"t_gap{g:g}" for g in GAPS])
+        for nombre in args.instancias:
+            ref = lp_ref.get(nombre)
+            if ref is None:
+                ref = min(tr[-1][1] for (n, _, _), tr in tray.items() if n == nombre)
+            for cruce in args.cruces:
+                for seed in seeds:
+                    tr = tray[(nombre, cruce, seed)]
+                    mejor = tr[-1][1]
+                    w.writerow([nombre, cruce, seed, ref, mejor, 100.0 * (mejor - ref) / ref, len(tr)]
+                               + [_tiempo_hasta(tr, ref * (1 + g / 100.0)) for g in GAPS])
+    print("Comparación ->", outcsv)
+
+    if not args.no_plots:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        for nombre in args.instancias:
+            plt.figure()
+            for cruce in args.cruces:
+                for i, seed in enumerate(seeds):
+                    tr = tray[(nombre, cruce, seed)]
+                    plt.plot([t for t, _ in tr], [d for _, d in tr], color=f"C{CRUCES.index(cruce)}",
+                             label=cruce if i == 0 else None, alpha=0.8)
+            plt.title(f"Tiempo a calidad por cruce - {nombre}")
+            plt.xlabel("segundos"); plt.ylabel("Mejor distancia")
+            plt.legend()
+            plt.savefig(os.path.join(RESULTS_DIR, f"cruces_{nombre}_tiempo_calidad.png"), bbox_inches="tight")
+            plt.close()
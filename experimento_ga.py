@@ -10,6 +10,7 @@ except Exception:
 
 from genetico import algoritmo_genetico
 from tsplib import leer_tsplib, build_distance_matrix
+from resultados_db import conectar, registrar_corrida_ga
 
 INSTANCIAS = {
     "eil101": "data/eil101.tsp",
@@ -23,6 +24,7 @@ RESULTS_DIR = "results"
 # snapshots / gif
 SNAPSHOT_EVERY = 50   
 SNAPSHOT_RUN = 1       
+GIF_FPS = 4
 PARAMS = {
     "eil101":   dict(n_poblacion=300, n_iter=1000, porc_elite=0.02, porc_cruce=0.68, porc_mut=0.30, prob_mut=0.2, selec_method="torneo"),
     "gr229":    dict(n_poblacion=500, n_iter=1500, porc_elite=0.02, porc_cruce=0.68, porc_mut=0.30, prob_mut=0.2, selec_method="torneo"),
@@ -56,6 +58,8 @@ def _make_gif(frame_glob, gif_path, fps=GIF_FPS):
 def correr_experimento():
     os.makedirs(RESULTS_DIR, exist_ok=True)
     outcsv = os.path.join(RESULTS_DIR, "ga_resultados.csv")
+    # CSV = foto de este barrido; la base SQLite acumula todas las corridas
+    db = conectar()
 
     with open(outcsv, "w", newline="") as csvfile:
         w = csv.writer(csvfile)
@@ -97,11 +101,12 @@ def correr_experimento():
                         on_generation=on_gen, 
                         **params
                     )
-                    if len(res) == 5:
-                        mejor_ruta, mejor_dist, historial, div_hist, _ = res
+                    if len(res) >= 5:
+                        mejor_ruta, mejor_dist, historial, div_hist, tiempos_gen = res[:5]
+                        gens = res[5] if len(res) > 5 else None
                     else:
                         mejor_ruta, mejor_dist, historial = res[:3]
-                        div_hist = None
+                        div_hist = tiempos_gen = gens = None
                 except TypeError:
                     # fallback API antigua
                     res = algoritmo_genetico(coords, seed=seed, **params)
@@ -109,7 +114,7 @@ def correr_experimento():
                         mejor_ruta, mejor_dist, historial = res[:3]
                     else:
                         mejor_ruta, mejor_dist, historial = res, None, None
-                    div_hist = None
+                    div_hist = tiempos_gen = gens = None
 
                 tiempo = time.time() - t0
                 print(f"Run {run}: distancia={mejor_dist:.6f}, tiempo={tiempo:.2f}s")
@@ -121,10 +126,18 @@ def correr_experimento():
                     params["prob_mut"], params["selec_method"],
                     mejor_dist, tiempo
                 ])
+                csvfile.flush()
+
+                # SQLite (append-only)
+                registrar_corrida_ga(
+                    db, nombre, params, seed, run, mejor_dist, tiempo,
+                    ruta=mejor_ruta, historial=historial, diversidad=div_hist, tiempos=tiempos_gen,
+                    gens=gens,
+                )
 
                 # Convergencia
                 if historial is not None:
-                    plt.figure(); plt.plot(historial)
+                    plt.figure(); plt.plot(*([gens, historial] if gens else [historial]))
                     plt.title(f"Convergencia GA - {nombre} (Run {run})")
                     plt.xlabel("Iteración"); plt.ylabel("Distancia")
                     plt.savefig(os.path.join(RESULTS_DIR, f"GA_{nombre}_run{run}_convergencia.png"), bbox_inches="tight")
@@ -132,7 +145,7 @@ def correr_experimento():
 
                 # Diversidad
                 if div_hist is not None:
-                    plt.figure(); plt.plot(div_hist)
+                    plt.figure(); plt.plot(*([gens, div_hist] if gens else [div_hist]))
                     plt.title(f"Diversidad GA - {nombre} (Run {run})")
                     plt.xlabel("Iteración"); plt.ylabel("Ind únicos / población")
                     plt.savefig(os.path.join(RESULTS_DIR, f"GA_{nombre}_run{run}_diversidad.png"), bbox_inches="tight")
@@ -152,6 +165,7 @@ def correr_experimento():
             if gif_ok:
                 print(f"[GIF] Evolución de ruta: {os.path.join(RESULTS_DIR, f'GA_{nombre}_evolucion.gif')}")
 
+    db.close()
     print("GA terminado ->", outcsv)
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
-import os, csv, matplotlib.pyplot as plt
+import os, csv, argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tsplib import leer_tsplib, build_distance_matrix
 from lp_solver import construir_y_resolver_mtz_dist
+from resultados_db import conectar, registrar_lp
 
 INSTANCIAS = {
     "eil101": "data/eil101.tsp",
@@ -9,28 +11,102 @@ INSTANCIAS = {
 }
 RESULTS_DIR = "results"
 
-def correr_lp(time_limit=3600, msg=False):
+# Configuración CBC por instancia (None = valor por defecto de CBC)
+CONFIG_LP = {
+    "eil101":    dict(time_limit=3600, threads=2, gap_rel=None),
+    "gr229":     dict(time_limit=3600, threads=4, gap_rel=None),
+    "inventado": dict(time_limit=3600, threads=2, gap_rel=None),
+}
+
+COLS = ["instancia", "status", "objetivo", "tiempo_seg", "n_vars", "n_constraints",
+        "incumbente", "cota", "gap", "resultado_cbc", "threads", "gap_rel", "time_limit"]
+
+def _resolver(nombre, archivo, cfg, msg):
+    # corre en un proceso aparte; el log de CBC queda en results/LP_<instancia>_cbc.log
+    ts = leer_tsplib(archivo)
+    D = build_distance_matrix(ts)
+    res = construir_y_resolver_mtz_dist(
+        D, msg=msg, time_limit_seconds=cfg.get("time_limit"), threads=cfg.get("threads"),
+        gap_rel=cfg.get("gap_rel"), log_path=os.path.join(RESULTS_DIR, f"LP_{nombre}_cbc.log"),
+    )
+    return nombre, ts["coords"], res
+
+def _plot_ruta(nombre, coords, res):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    ruta = res["route"] + [res["route"][0]]
+    xs = [coords[i][0] for i in ruta]
+    ys = [coords[i][1] for i in ruta]
+    plt.figure(figsize=(6,6)); plt.plot(xs, ys, "-o", markersize=3)
+    plt.title(f"Ruta LP MTZ - {nombre} ({res['status']})")
+    plt.savefig(os.path.join(RESULTS_DIR, f"LP_{nombre}_ruta.png"), bbox_inches="tight")
+    plt.close()
+
+def correr_lp(time_limit=None, msg=False, workers=None, config=None, instancias=None):
+    """
+    Resuelve las instancias en procesos separados (concurrentes). `config` sobreescribe
+    CONFIG_LP por instancia; `time_limit` (si se da) aplica a todas. Cada fila se escribe
+    en el CSV y en la base apenas termina su instancia, así los resultados parciales sirven.
+    """
     os.makedirs(RESULTS_DIR, exist_ok=True)
     outcsv = os.path.join(RESULTS_DIR, "lp_resultados.csv")
-    with open(outcsv, "w", newline="") as f:
+    nombres = instancias or list(INSTANCIAS)
+    cfgs = {}
+    for nombre in nombres:
+        cfg = dict(CONFIG_LP.get(nombre, {}))
+        cfg.update((config or {}).get(nombre, {}))
+        if time_limit is not None:
+            cfg["time_limit"] = time_limit
+        cfgs[nombre] = cfg
+
+    db = conectar()
+    with open(outcsv, "w", newline="") as f, \
+         ProcessPoolExecutor(max_workers=workers or len(nombres)) as pool:
         w = csv.writer(f)
-        w.writerow(["instancia","status","objetivo","tiempo_seg","n_vars","n_constraints"])
-        for nombre, archivo in INSTANCIAS.items():
-            ts = leer_tsplib(archivo)
-            D = build_distance_matrix(ts)
-            res = construir_y_resolver_mtz_dist(D, msg=msg, time_limit_seconds=time_limit)
-            w.writerow([nombre, res["status"], res["objective"], res["time"], res["n_vars"], res["n_constraints"]])
+        w.writerow(COLS)
+        f.flush()
+        futuros = {pool.submit(_resolver, n, INSTANCIAS[n], cfgs[n], msg): n for n in nombres}
+        for fut in as_completed(futuros):
+            nombre = futuros[fut]
+            cfg = cfgs[nombre]
+            try:
+                _, coords, res = fut.result()
+            except Exception as e:
+                # una instancia que falla no descarta las demás: queda una fila de error (CSV y base)
+                error = f"{type(e).__name__}: {e}"
+                w.writerow([nombre, "Error", None, None, None, None, None, None, None,
+                            error, cfg.get("threads"), cfg.get("gap_rel"), cfg.get("time_limit")])
+                f.flush()
+                registrar_lp(db, nombre, {"status": "Error", "resultado_cbc": error},
+                             time_limit=cfg.get("time_limit"), threads=cfg.get("threads"), gap_rel=cfg.get("gap_rel"))
+                print(f"[LP] {nombre}: error ({error})")
+                continue
+            w.writerow([nombre, res["status"], res["objective"], res["time"], res["n_vars"], res["n_constraints"],
+                        res.get("incumbente"), res.get("cota"), res.get("gap"), res.get("resultado_cbc"),
+                        cfg.get("threads"), cfg.get("gap_rel"), cfg.get("time_limit")])
+            f.flush()
+            registrar_lp(db, nombre, res, time_limit=cfg.get("time_limit"),
+                         threads=cfg.get("threads"), gap_rel=cfg.get("gap_rel"))
+            print(f"[LP] {nombre}: {res['status']} ({res.get('resultado_cbc')}) obj={res['objective']} "
+                  f"cota={res.get('cota')} t={res['time']:.1f}s")
 
             # PNG de la ruta
             if res.get("route"):
-                ruta = res["route"] + [res["route"][0]]
-                xs = [ts["coords"][i][0] for i in ruta]
-                ys = [ts["coords"][i][1] for i in ruta]
-                plt.figure(figsize=(6,6)); plt.plot(xs, ys, "-o", markersize=3)
-                plt.title(f"Ruta LP MTZ - {nombre} ({res['status']})")
-                plt.savefig(os.path.join(RESULTS_DIR, f"LP_{nombre}_ruta.png"), bbox_inches="tight")
-                plt.close()
+                _plot_ruta(nombre, coords, res)
+    db.close()
     print("LP terminado ->", outcsv)
 
 if __name__ == "__main__":
-    correr_lp()
+    parser = argparse.ArgumentParser(description="Corridas LP/MTZ en paralelo (una instancia por proceso)")
+    parser.add_argument("--instancias", nargs="+", choices=list(INSTANCIAS), default=None)
+    parser.add_argument("--time_limit", type=int, default=None, help="Límite (s) para todas; si no, CONFIG_LP")
+    parser.add_argument("--threads", type=int, default=None, help="Hilos CBC para todas; si no, CONFIG_LP")
+    parser.add_argument("--gap_rel", type=float, default=None, help="Gap relativo de parada para todas")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos concurrentes (def: una por instancia)")
+    parser.add_argument("--msg", action="store_true")
+    args = parser.parse_args()
+
+    override = {k: v for k, v in (("threads", args.threads), ("gap_rel", args.gap_rel)) if v is not None}
+    correr_lp(time_limit=args.time_limit, msg=args.msg, workers=args.workers,
+              config={n: override for n in INSTANCIAS}, instancias=args.instancias)
@@ -0,0 +1,152 @@
+# generar_instancias.py
+import os
+import math
+import time
+import argparse
+import numpy as np
+
+DISTRIBUCIONES = ("uniforme", "clusters", "grilla", "anillo")
+ESCALA = 1000.0                       # lado del cuadrado EUC_2D
+CAJA_GEO = (-60.0, 70.0, -180.0, 180.0)  # lat_min, lat_max, lon_min, lon_max (grados)
+BLOQUE = 100_000                      # filas por bloque al escribir TSPLIB
+
+# =====================
+# DISTRIBUCIONES (puntos en [0, 1]^2)
+# =====================
+
+def _uniforme(rng, n):
+    return rng.random((n, 2))
+
+def _clusters(rng, n, n_clusters=None, sigma=0.03):
+    # mezcla de gaussianas con pesos aleatorios
+    k = n_clusters or max(2, int(round(math.sqrt(n) / 4)))
+    centros = rng.random((k, 2))
+    pesos = rng.dirichlet(np.ones(k))
+    asign = rng.choice(k, size=n, p=pesos)
+    pts = centros[asign] + rng.normal(0.0, sigma, size=(n, 2))
+    return np.clip(pts, 0.0, 1.0)
+
+def _grilla(rng, n, ruido=0.0):
+    lado = math.ceil(math.sqrt(n))
+    idx = np.arange(n)
+    pts = np.column_stack([idx % lado, idx // lado]).astype(float) / max(1, lado - 1)
+    if ruido:
+        pts += rng.normal(0.0, ruido / lado, size=(n, 2))
+    return np.clip(pts, 0.0, 1.0)
+
+def _anillo(rng, n, ruido=0.05):
+    # como inventado.tsp: círculo con ruido radial
+    ang = rng.random(n) * 2 * np.pi
+    r = 0.4 + rng.normal(0.0, ruido, size=n)
+    return np.clip(np.column_stack([0.5 + r * np.cos(ang), 0.5 + r * np.sin(ang)]), 0.0, 1.0)
+
+_GENERADORES = {"uniforme": _uniforme, "clusters": _clusters, "grilla": _grilla, "anillo": _anillo}
+
+
+def generar_coords(distribucion, n, seed=None, tipo="EUC_2D", escala=ESCALA, caja_geo=CAJA_GEO, **kw):
+    """
+    Devuelve coords (n x 2, float64) reproducibles para `seed`.
+      - EUC_2D: puntos en [0, escala]^2.
+      - GEO: (latitud, longitud) en formato TSPLIB DDD.MM dentro de caja_geo.
+    kw se pasa a la distribución (n_clusters, sigma, ruido).
+    """
+    if distribucion not in _GENERADORES:
+        raise ValueError(f"distribución no soportada: {distribucion} (opciones: {', '.join(DISTRIBUCIONES)})")
+    rng = np.random.default_rng(seed)
+    pts = _GENERADORES[distribucion](rng, n, **kw)
+    tipo = tipo.upper()
+    if tipo == "EUC_2D":
+        return pts * escala
+    if tipo == "GEO":
+        lat0, lat1, lon0, lon1 = caja_geo
+        grados = np.column_stack([lat0 + pts[:, 1] * (lat1 - lat0), lon0 + pts[:, 0] * (lon1 - lon0)])
+        return _a_ddd_mm(grados)
+    raise ValueError(f"EDGE_WEIGHT_TYPE no soportado: {tipo}")
+
+
+def _a_ddd_mm(grados):
+    # grados decimales -> DDD.MM (parte entera = grados, decimales = minutos/100), como lee tsplib._geo_to_rad
+    signo = np.sign(grados)
+    a = np.abs(grados)
+    deg = np.floor(a)
+    minutos = np.round((a - deg) * 60.0, 2)
+    return signo * (deg + minutos / 100.0)
+
+
+# =====================
+# ESCRITURA
+# =====================
+
+def escribir_tsplib(archivo, coords, nombre, tipo="EUC_2D", comentario=None):
+    """
+    Escribe un .tsp TSPLIB. El formateo es por bloques (una sola operación % por bloque),
+    sin bucle Python por línea.
+    """
+    n = len(coords)
+    d = os.path.dirname(archivo)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    filas = np.column_stack([np.arange(1, n + 1, dtype=float), coords])
+    with open(archivo, "w") as f:
+        f.write(f"NAME: {nombre}\nTYPE: TSP\n")
+        if comentario:
+            f.write(f"COMMENT: {comentario}\n")
+        f.write(f"DIMENSION: {n}\nEDGE_WEIGHT_TYPE: {tipo}\nNODE_COORD_SECTION\n")
+        for i in range(0, n, BLOQUE):
+            bloque = filas[i:i + BLOQUE]
+            f.write(("%d %.6f %.6f\n" * len(bloque)) % tuple(bloque.ravel()))
+        f.write("EOF\n")
+
+
+def escribir_npz(archivo, coords, nombre, tipo="EUC_2D"):
+    """Forma binaria (leíble con tsplib.leer_tsplib): name, edge_type, coords."""
+    d = os.path.dirname(archivo)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    np.savez_compressed(archivo, name=np.array(nombre), edge_type=np.array(tipo),
+                        coords=np.asarray(coords, dtype=float))
+
+
+def generar_instancia(distribucion, n, seed=0, tipo="EUC_2D", salida="data/generadas",
+                      tsp=True, npz=False, **kw):
+    """
+    Genera y guarda una instancia; el nombre codifica sus parámetros
+    (<distribucion><n>_<tipo>_s<seed>) para poder regenerarla idéntica.
+    Devuelve dict con nombre, rutas escritas y coords.
+    """
+    tipo = tipo.upper()
+    nombre = f"{distribucion}{n}_{tipo.lower()}_s{seed}"
+    # redondeo a los 6 decimales del .tsp: ambas formas guardan exactamente las mismas coords
+    coords = np.round(generar_coords(distribucion, n, seed=seed, tipo=tipo, **kw), 6)
+    rutas = []
+    if tsp:
+        rutas.append(os.path.join(salida, f"{nombre}.tsp"))
+        escribir_tsplib(rutas[-1], coords, nombre, tipo,
+                        comentario=f"generar_instancias.py {distribucion} n={n} seed={seed}")
+    if npz:
+        rutas.append(os.path.join(salida, f"{nombre}.npz"))
+        escribir_npz(rutas[-1], coords, nombre, tipo)
+    return {"nombre": nombre, "rutas": rutas, "coords": coords}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generador de instancias TSP sintéticas (TSPLIB / .npz)")
+    parser.add_argument("--distribucion", choices=DISTRIBUCIONES, nargs="+", default=["uniforme"])
+    parser.add_argument("--n", type=int, nargs="+", default=[1000], help="ciudades (p.ej. 100 1000 100000 1000000)")
+    parser.add_argument("--tipo", choices=["EUC_2D", "GEO"], default="EUC_2D")
+    parser.add_argument("--seed", type=int, nargs="+", default=[0])
+    parser.add_argument("--salida", default="data/generadas")
+    parser.add_argument("--npz", action="store_true", help="además escribe la forma binaria .npz")
+    parser.add_argument("--solo-npz", action="store_true", help="solo .npz (sin .tsp)")
+    parser.add_argument("--n_clusters", type=int, default=None, help="(clusters) número de gaussianas")
+    parser.add_argument("--sigma", type=float, default=0.03, help="(clusters) desvío relativo al lado")
+    args = parser.parse_args()
+
+    for dist in args.distribucion:
+        kw = dict(n_clusters=args.n_clusters, sigma=args.sigma) if dist == "clusters" else {}
+        for n in args.n:
+            for seed in args.seed:
+                t0 = time.time()
+                inst = generar_instancia(dist, n, seed=seed, tipo=args.tipo, salida=args.salida,
+                                         tsp=not args.solo_npz, npz=args.npz or args.solo_npz, **kw)
+                print(f"{inst['nombre']}: {', '.join(inst['rutas'])} ({time.time() - t0:.2f}s)")
@@ -2,6 +2,8 @@
 import numpy as np
 import random
 import time
+import threading
+from collections import deque
 
 # =====================
 # FUNCIONES AUXILIARES
@@ -72,16 +74,378 @@ def mutacion_swap(ruta):
     ruta[i], ruta[j] = ruta[j], ruta[i]
     return ruta
 
+# =====================
+# CRUCES POR ARISTAS (ERX / EAX)
+# =====================
+
+def adyacencia(ruta):
+    """
+    Adyacencia de un tour como arreglo n x 2: adj[c] = [predecesor, sucesor] de la ciudad c.
+    """
+    r = np.asarray(ruta, dtype=np.intp)
+    adj = np.empty((len(r), 2), dtype=np.intp)
+    adj[r, 0] = np.roll(r, 1)
+    adj[r, 1] = np.roll(r, -1)
+    return adj
+
+def _ruta_desde_adyacencia(adj, inicio=0):
+    # recorre el ciclo hamiltoniano codificado en adj (lista n x 2)
+    n = len(adj)
+    ruta = [inicio]
+    prev, cur = inicio, adj[inicio][1]
+    while len(ruta) < n:
+        ruta.append(cur)
+        a, b = adj[cur]
+        prev, cur = cur, (b if a == prev else a)
+    return ruta
+
+def vecinos_cercanos(dist_matrix, k=10):
+    """k vecinos más cercanos de cada ciudad (n x k), para reconectar subtours en EAX."""
+    n = dist_matrix.shape[0]
+    k = min(k, n - 1)
+    D = dist_matrix.astype(float, copy=True)
+    np.fill_diagonal(D, np.inf)
+    idx = np.argpartition(D, k - 1, axis=1)[:, :k]
+    orden = np.take_along_axis(D, idx, axis=1).argsort(axis=1)
+    return np.take_along_axis(idx, orden, axis=1)
+
+def cruce_ERX(padre1, padre2):
+    """
+    Edge recombination: el hijo hereda preferentemente aristas presentes en ambos padres
+    y, si no hay, va a la ciudad vecina con menos vecinos pendientes. O(n) por hijo.
+    """
+    n = len(padre1)
+    # tabla de aristas n x 4 (pred/suc en cada padre); una arista común aparece dos veces
+    aristas = np.concatenate([adyacencia(padre1), adyacencia(padre2)], axis=1).tolist()
+    visitado = [False] * n
+    # ciudades pendientes con borrado O(1) (swap con la última)
+    pendientes = list(range(n))
+    pos = list(range(n))
+
+    actual = int(padre1[0])
+    hijo = []
+    while True:
+        hijo.append(actual)
+        visitado[actual] = True
+        i, ultimo = pos[actual], pendientes[-1]
+        pendientes[i], pos[ultimo] = ultimo, i
+        pendientes.pop()
+        if not pendientes:
+            break
+
+        vec = [v for v in aristas[actual] if not visitado[v]]
+        if not vec:
+            actual = pendientes[random.randrange(len(pendientes))]
+            continue
+        elegido = None
+        for j, v in enumerate(vec):
+            if v in vec[j + 1:]:   # arista común a ambos padres
+                elegido = v
+                break
+        if elegido is None:
+            mejores, min_grado = [], 5
+            for v in vec:
+                grado = len({w for w in aristas[v] if not visitado[w]})
+                if grado < min_grado:
+                    mejores, min_grado = [v], grado
+                elif grado == min_grado:
+                    mejores.append(v)
+            elegido = random.choice(mejores)
+        actual = elegido
+    return hijo
+
+def _ciclos_AB(adjA, adjB):
+    """
+    Descompone las aristas no comunes de A y B en ciclos AB (caminatas cerradas que
+    alternan una arista de A y una de B). Devuelve lista de listas de nodos [v0, v1, ..., v0].
+    """
+    n = len(adjA)
+    solo_a = [[v for v in adjA[u] if v not in adjB[u]] for u in range(n)]
+    solo_b = [[v for v in adjB[u] if v not in adjA[u]] for u in range(n)]
+    con_a = [u for u in range(n) if solo_a[u]]
+    random.shuffle(con_a)
+    ciclos = []
+    for s in con_a:
+        while solo_a[s]:
+            camino, u, usar_a = [s], s, True
+            while True:
+                lado = solo_a if usar_a else solo_b
+                v = lado[u][random.randrange(len(lado[u]))]
+                lado[u].remove(v); lado[v].remove(u)
+                camino.append(v)
+                u = v
+                if not usar_a and u == s:
+                    break
+                usar_a = not usar_a
+            ciclos.append(camino)
+    return ciclos
+
+def cruce_EAX(padre1, padre2, dist_matrix, vecinos=None):
+    """
+    Cruce EAX (una AB-cycle al azar): parte del tour de padre1, quita las aristas de A
+    de un ciclo AB y agrega las de B; los subtours resultantes se unen con el
+    intercambio 2-opt de menor costo entre vecinos cercanos.
+    """
+    adjA = adyacencia(padre1).tolist()
+    adjB = adyacencia(padre2).tolist()
+    ciclos = _ciclos_AB(adjA, adjB)
+    if not ciclos:
+        return list(padre1)   # padres idénticos
+    ciclo = ciclos[random.randrange(len(ciclos))]
+
+    adj = [a[:] for a in adjA]
+    for k in range(len(ciclo) - 1):
+        u, v = ciclo[k], ciclo[k + 1]
+        if k % 2 == 0:   # arista de A: se quita
+            adj[u][adj[u].index(v)] = -1
+            adj[v][adj[v].index(u)] = -1
+    for k in range(1, len(ciclo) - 1, 2):   # aristas de B: se agregan
+        u, v = ciclo[k], ciclo[k + 1]
+        adj[u][adj[u].index(-1)] = v
+        adj[v][adj[v].index(-1)] = u
+
+    # etiquetar subtours
+    n = len(adj)
+    comp = [-1] * n
+    miembros = []
+    for s in range(n):
+        if comp[s] != -1:
+            continue
+        c = len(miembros)
+        nodos = [s]; comp[s] = c
+        prev, cur = s, adj[s][1]
+        while cur != s:
+            nodos.append(cur); comp[cur] = c
+            a, b = adj[cur]
+            prev, cur = cur, (b if a == prev else a)
+        miembros.append(nodos)
+
+    vivos = set(range(len(miembros)))
+    while len(vivos) > 1:
+        c = min(vivos, key=lambda i: len(miembros[i]))
+        mejor = None
+        for u in miembros[c]:
+            cands = vecinos[u] if vecinos is not None else ()
+            cands = [v for v in cands if comp[v] != c]
+            if not cands and mejor is None and u == miembros[c][-1]:
+                # ningún vecino cercano fuera del subtour: buscar en todo el resto
+                fuera = [v for v in range(n) if comp[v] != c]
+                cands = [fuera[int(np.argmin(dist_matrix[u, fuera]))]]
+            for v in cands:
+                for u2 in adj[u]:
+                    for v2 in adj[v]:
+                        base = dist_matrix[u, u2] + dist_matrix[v, v2]
+                        for a, b, x, y in ((u, v, u2, v2), (u, v2, u2, v)):
+                            delta = dist_matrix[a, b] + dist_matrix[x, y] - base
+                            if mejor is None or delta < mejor[0]:
+                                mejor = (delta, u, u2, v, v2, a, b, x, y)
+        _, u, u2, v, v2, a, b, x, y = mejor
+        # quitar (u,u2) y (v,v2); agregar (a,b) y (x,y)
+        adj[u][adj[u].index(u2)] = -1; adj[u2][adj[u2].index(u)] = -1
+        adj[v][adj[v].index(v2)] = -1; adj[v2][adj[v2].index(v)] = -1
+        for p, q in ((a, b), (x, y)):
+            adj[p][adj[p].index(-1)] = q
+            adj[q][adj[q].index(-1)] = p
+        # fusionar etiquetas (el subtour chico pasa al otro)
+        destino = comp[v]
+        for w in miembros[c]:
+            comp[w] = destino
+        miembros[destino].extend(miembros[c])
+        miembros[c] = []
+        vivos.discard(c)
+
+    return _ruta_desde_adyacencia(adj, int(padre1[0]))
+
+CRUCES = ("ox", "erx", "eax")
+
+def _operador_cruce(nombre, ciudades, dist_matrix):
+    """Devuelve cruce(p1, p2) para el nombre dado ("ox" | "erx" | "eax")."""
+    if nombre == "ox":
+        return cruce_OX
+    if nombre == "erx":
+        return cruce_ERX
+    if nombre == "eax":
+        D_eax = dist_matrix
+        if D_eax is None:
+            c = np.asarray(ciudades, dtype=float)
+            D_eax = np.sqrt(((c[:, None, :] - c[None, :, :]) ** 2).sum(axis=-1))
+        vecinos = vecinos_cercanos(D_eax).tolist()
+        def cruce(p1, p2):
+            return cruce_EAX(p1, p2, D_eax, vecinos)
+        return cruce
+    raise ValueError(f"crossover no soportado: {nombre} (opciones: {', '.join(CRUCES)}, adaptativo)")
+
 def medir_diversidad(poblacion):
     # porcentaje de individuos únicos (por comparación directa)
     únicos = {tuple(ind) for ind in poblacion}
     return len(únicos) / len(poblacion)
 
+# =====================
+# CANCELACIÓN / HISTORIAL
+# =====================
+
+class TokenCancelacion:
+    """
+    Bandera de cancelación cooperativa; se puede activar desde otro hilo.
+    `evento` permite usar otro Event (p.ej. de multiprocessing.Manager) para cancelar
+    desde otro proceso.
+    """
+
+    def __init__(self, evento=None):
+        self._evento = evento if evento is not None else threading.Event()
+
+    def cancelar(self):
+        self._evento.set()
+
+    @property
+    def cancelado(self):
+        return self._evento.is_set()
+
+
+class Historial:
+    """
+    Serie por generación con almacenamiento acotado:
+      - cada: guarda solo las generaciones múltiplo de `cada` (diezmado).
+      - max_len: conserva solo los últimos `max_len` puntos (buffer circular).
+    `gens` guarda la generación de cada valor conservado.
+    """
+
+    def __init__(self, max_len=None, cada=1):
+        self.cada = max(1, int(cada))
+        self.gens = deque(maxlen=max_len)
+        self.valores = deque(maxlen=max_len)
+
+    def append(self, gen, valor):
+        if gen % self.cada == 0:
+            self.gens.append(gen)
+            self.valores.append(valor)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def __iter__(self):
+        return iter(self.valores)
+
+
+# =====================
+# CONTROL ADAPTATIVO
+# =====================
+
+def _cupos(n_poblacion, porc_elite, porc_cruce, porc_mut):
+    """Tamaños (élite, cruce, mutación, aleatorios) de la nueva población."""
+    elite_size = max(1, int(porc_elite * n_poblacion))
+    num_cruce  = max(0, int(porc_cruce * n_poblacion))
+    # recorta cruce para no pasarte del total
+    num_cruce  = min(num_cruce, n_poblacion - elite_size)
+
+    num_mut    = max(0, int(porc_mut * n_poblacion))
+    # recorta mutación para no pasarte del total
+    num_mut    = min(num_mut, n_poblacion - elite_size - num_cruce)
+
+    # lo que queda se llena con individuos aleatorios (para diversidad)
+    num_random = max(0, n_poblacion - elite_size - num_cruce - num_mut)
+    return elite_size, num_cruce, num_mut, num_random
+
+
+class ControlAdaptativo:
+    """
+    Ajusta por generación prob_mut, el reparto de hijos cruce/mutación y torneo_k según
+    la mejora relativa de la mejor distancia en las últimas `ventana` generaciones y la
+    diversidad de la población:
+      - estancamiento (mejora < mejora_min) o colapso (diversidad < div_min): más
+        mutación (prob_mut y porc_mut crecen por `paso`);
+      - con mejora: las tasas vuelven gradualmente a sus valores iniciales;
+      - torneo_k baja ante colapso de diversidad y sube (hasta torneo_k_lim) solo si hay
+        mejora y la diversidad supera div_max; se ajusta cada `ventana` generaciones.
+    Con varios operadores de cruce, los elige por éxito reciente (probability matching:
+    un hijo es exitoso si queda mejor que la mediana de la generación de sus padres).
+    Con adaptar_tasas=False solo actúa el bandido de operadores (tasas y torneo_k fijos).
+    Cada generación se agrega el estado a `trayectoria`.
+    """
+
+    def __init__(self, ventana=20, mejora_min=1e-3, div_min=0.8, div_max=0.95, paso=1.1,
+                 prob_mut_lim=(0.02, 0.9), porc_mut_lim=(0.05, 0.6), torneo_k_lim=(2, 6),
+                 retorno=0.1, alpha=0.1, p_min=0.05, adaptar_tasas=True):
+        self.adaptar_tasas = adaptar_tasas
+        self.ventana = ventana
+        self.mejora_min = mejora_min
+        self.div_min = div_min
+        self.div_max = div_max
+        self.paso = paso
+        self.prob_mut_lim = prob_mut_lim
+        self.porc_mut_lim = porc_mut_lim
+        self.torneo_k_lim = torneo_k_lim
+        self.retorno = retorno
+        self.alpha = alpha
+        self.p_min = p_min
+        self.trayectoria = []
+
+    def iniciar(self, prob_mut, porc_cruce, porc_mut, torneo_k, operadores=("ox",)):
+        self.prob_mut = self.prob_mut0 = prob_mut
+        self.porc_mut = self.porc_mut0 = porc_mut
+        self.porc_hijos = porc_cruce + porc_mut   # cruce + mutación se mantiene constante
+        self.torneo_k = torneo_k
+        self.operadores = list(operadores)
+        self.calidad = [0.5] * len(self.operadores)
+        self.pesos = [1.0 / len(self.operadores)] * len(self.operadores)
+        self._mejores = deque(maxlen=self.ventana + 1)
+        self.trayectoria = []
+
+    def elegir_operador(self):
+        return random.choices(range(len(self.operadores)), weights=self.pesos)[0]
+
+    def recompensar(self, op, exito):
+        self.calidad[op] += self.alpha * ((1.0 if exito else 0.0) - self.calidad[op])
+
+    def actualizar(self, gen, mejor_distancia, diversidad):
+        self._mejores.append(mejor_distancia)
+        previo = self._mejores[0]
+        mejora = (previo - mejor_distancia) / previo if previo > 0 else 0.0
+        ajustar_k = gen > 0 and gen % self.ventana == 0
+
+        if self.adaptar_tasas and len(self._mejores) > self.ventana // 2:
+            lo, hi = self.prob_mut_lim
+            mhi = min(self.porc_mut_lim[1], self.porc_hijos)
+            mlo = min(self.porc_mut_lim[0], mhi)
+            klo, khi = self.torneo_k_lim
+            colapso = diversidad < self.div_min
+            if mejora < self.mejora_min or colapso:
+                # desde el piso del rango: una tasa inicial 0 también puede subir
+                self.prob_mut = min(hi, max(self.prob_mut, lo) * self.paso)
+                self.porc_mut = min(mhi, max(self.porc_mut, mlo) * self.paso)
+            else:
+                self.prob_mut += self.retorno * (self.prob_mut0 - self.prob_mut)
+                self.porc_mut += self.retorno * (self.porc_mut0 - self.porc_mut)
+            if ajustar_k:
+                if colapso:
+                    self.torneo_k = max(klo, self.torneo_k - 1)
+                elif diversidad > self.div_max and mejora >= self.mejora_min:
+                    self.torneo_k = min(khi, self.torneo_k + 1)
+
+        if len(self.operadores) > 1:
+            total = sum(self.calidad) or 1.0
+            k = len(self.operadores)
+            self.pesos = [self.p_min + (1 - k * self.p_min) * q / total for q in self.calidad]
+
+        estado = {
+            "gen": gen,
+            "mejora": float(mejora),
+            "diversidad": diversidad,
+            "prob_mut": self.prob_mut,
+            "porc_cruce": self.porc_hijos - self.porc_mut,
+            "porc_mut": self.porc_mut,
+            "torneo_k": self.torneo_k,
+            "pesos_cruce": dict(zip(self.operadores, self.pesos)),
+        }
+        self.trayectoria.append(estado)
+        return estado
+
+
 # =====================
 # ALGORITMO GENÉTICO (MEJORADO)
 # =====================
 
-def algoritmo_genetico(
+def iter_genetico(
     ciudades,
     n_poblacion=100,
     n_iter=500,
@@ -91,16 +455,26 @@ def algoritmo_genetico(
     selec_method="torneo",
     torneo_k=3,
     seed=None,
-    return_all=False,
     porc_mut=None,
     dist_matrix=None,
-    on_generation=None,
+    time_limit=None,
+    cancel=None,
+    crossover="ox",
+    control=None,
 ):
     """
-    - porc_mut: fracción creada por mutación (distinta de prob_mut).
-      Si es None, se toma el remanente: max(0, 1 - porc_elite - porc_cruce).
-      Los hijos "mutación" se generan seleccionando un individuo base y aplicando swap obligado (≥1).
-    - prob_mut: prob. de mutación aplicada a CADA hijo de cruce.
+    Versión generadora del GA: produce un dict por generación con
+      gen, mejor_ruta, mejor_distancia, distancia_gen (mejor de la población actual),
+      diversidad, tiempo_gen, tiempo_total.
+    Se puede cortar en cualquier momento con .close() / break, con un
+    TokenCancelacion (`cancel`) o con `time_limit` (segundos).
+    `mejor_ruta` es compartida entre generaciones hasta que mejora: no mutarla.
+    crossover: "ox" (orden), "erx" (edge recombination), "eax" (edge assembly), una lista
+      de ellos o "adaptativo" (todos); con varios, un bandido elige el operador por hijo
+      (sin `control` explícito, las tasas quedan fijas).
+    control: ControlAdaptativo (o True para uno por defecto) que ajusta prob_mut, el reparto
+      cruce/mutación y torneo_k cada generación; su estado se entrega en "control" y se
+      guarda en control.trayectoria.
     """
     if seed is not None:
         random.seed(seed); np.random.seed(seed)
@@ -108,27 +482,38 @@ def algoritmo_genetico(
     n_ciudades = len(ciudades) if ciudades is not None else (dist_matrix.shape[0] if dist_matrix is not None else None)
     poblacion = crear_poblacion(n_ciudades, n_poblacion, seed=seed)
 
+    # ---- Operador(es) de cruce ----
+    if crossover == "adaptativo":
+        nombres_cruce = list(CRUCES)
+    elif isinstance(crossover, (list, tuple)):
+        nombres_cruce = list(crossover)
+    else:
+        nombres_cruce = [crossover]
+    cruces = [_operador_cruce(nombre, ciudades, dist_matrix) for nombre in nombres_cruce]
+    cruce = cruces[0]
+    if control is True:
+        control = ControlAdaptativo()
+    elif len(cruces) > 1 and control is None:
+        control = ControlAdaptativo(adaptar_tasas=False)   # solo el bandido de operadores
+    if control is not None:
+        control.iniciar(prob_mut, porc_cruce, porc_mut if porc_mut is not None else max(0.0, 1.0 - (porc_elite + porc_cruce)),
+                        torneo_k, nombres_cruce)
+
     # ---- Cálculo de cupos ----
     if porc_mut is None:
         porc_mut = max(0.0, 1.0 - (porc_elite + porc_cruce))
-
-    elite_size = max(1, int(porc_elite * n_poblacion))
-    num_cruce  = max(0, int(porc_cruce * n_poblacion))
-    # recorta cruce para no pasarte del total
-    num_cruce  = min(num_cruce, n_poblacion - elite_size)
-
-    num_mut    = max(0, int(porc_mut * n_poblacion))
-    # recorta mutación para no pasarte del total
-    num_mut    = min(num_mut, n_poblacion - elite_size - num_cruce)
-
-    # lo que queda se llena con individuos aleatorios (para diversidad)
-    num_random = max(0, n_poblacion - elite_size - num_cruce - num_mut)
+    elite_size, num_cruce, num_mut, num_random = _cupos(n_poblacion, porc_elite, porc_cruce, porc_mut)
 
     mejor_ruta, mejor_distancia = None, float("inf")
-    historial, historial_diversity, tiempos = [], [], []
+    origen, ref_origen = [], float("inf")   # operador que creó cada individuo (-1 = ninguno)
+    t_inicio = time.time()
 
     for gen in range(n_iter):
         t0 = time.time()
+        if cancel is not None and cancel.cancelado:
+            break
+        if time_limit is not None and gen > 0 and t0 - t_inicio >= time_limit:
+            break
         # fitness
         fitness = [
             calcular_distancia_total(ind, ciudades, dist_matrix=dist_matrix) for ind in poblacion
@@ -139,13 +524,19 @@ def algoritmo_genetico(
             mejor_distancia = pop_fit[0][1]
             mejor_ruta = pop_fit[0][0][:]
 
-        historial.append(mejor_distancia)
-        historial_diversity.append(medir_diversidad([p for p,_ in pop_fit]))
-        if on_generation is not None:
-            try:
-                on_generation(gen, mejor_ruta, mejor_distancia)
-            except Exception:
-                pass
+        diversidad = medir_diversidad([p for p,_ in pop_fit])
+
+        # ---- Control adaptativo: crédito a operadores y ajuste de tasas ----
+        if control is not None:
+            for i, op in enumerate(origen):
+                if op >= 0:
+                    control.recompensar(op, fitness[i] < ref_origen)
+            estado_control = control.actualizar(gen, mejor_distancia, diversidad)
+            prob_mut, torneo_k = estado_control["prob_mut"], estado_control["torneo_k"]
+            elite_size, num_cruce, num_mut, num_random = _cupos(
+                n_poblacion, porc_elite, estado_control["porc_cruce"], estado_control["porc_mut"])
+            origen = [-1] * elite_size
+            ref_origen = float(np.median(fitness))
         nueva = []
 
         nueva.extend([pf[0][:] for pf in pop_fit[:elite_size]])
@@ -157,10 +548,17 @@ def algoritmo_genetico(
 
         while len(nueva) < elite_size + num_cruce:
             p1, p2 = pick(), pick()
-            hijo = cruce_OX(p1, p2)
+            if len(cruces) > 1:
+                op = control.elegir_operador()
+                hijo = cruces[op](p1, p2)
+            else:
+                op = 0
+                hijo = cruce(p1, p2)
             if random.random() < prob_mut:
                 hijo = mutacion_swap(hijo)
             nueva.append(hijo)
+            if control is not None:
+                origen.append(op)
 
         while len(nueva) < elite_size + num_cruce + num_mut:
             base = pick()                    
@@ -172,11 +570,84 @@ def algoritmo_genetico(
             nueva.append(list(np.random.permutation(n_ciudades)))
 
         poblacion = nueva
-        tiempos.append(time.time() - t0)
+        if control is not None:
+            origen.extend([-1] * (n_poblacion - len(origen)))
+        t1 = time.time()
+        yield {
+            "gen": gen,
+            "mejor_ruta": mejor_ruta,
+            "mejor_distancia": mejor_distancia,
+            "distancia_gen": pop_fit[0][1],
+            "diversidad": diversidad,
+            "tiempo_gen": t1 - t0,
+            "tiempo_total": t1 - t_inicio,
+            "control": estado_control if control is not None else None,
+        }
+
+
+def algoritmo_genetico(
+    ciudades,
+    n_poblacion=100,
+    n_iter=500,
+    porc_elite=0.02,
+    porc_cruce=0.7,
+    prob_mut=0.2,
+    selec_method="torneo",
+    torneo_k=3,
+    seed=None,
+    return_all=False,
+    porc_mut=None,
+    dist_matrix=None,
+    on_generation=None,
+    time_limit=None,
+    cancel=None,
+    historial_max=None,
+    historial_cada=1,
+    crossover="ox",
+    control=None,
+):
+    """
+    - porc_mut: fracción creada por mutación (distinta de prob_mut).
+      Si es None, se toma el remanente: max(0, 1 - porc_elite - porc_cruce).
+      Los hijos "mutación" se generan seleccionando un individuo base y aplicando swap obligado (≥1).
+    - prob_mut: prob. de mutación aplicada a CADA hijo de cruce.
+    - time_limit: segundos máximos de ejecución; si se alcanza, se corta antes de n_iter.
+    - cancel: TokenCancelacion para cortar la corrida desde otro hilo.
+    - historial_max / historial_cada: acotan las series devueltas (ver Historial).
+    - return_all: devuelve (ruta, distancia, historial, diversidad, tiempos, gens), donde
+      gens es la generación de cada punto de las series (no contigua si se diezma/acota).
+    - crossover: "ox" | "erx" | "eax" | lista | "adaptativo" (ver iter_genetico).
+    - control: ControlAdaptativo (o True para uno por defecto); ver control.trayectoria.
+    - on_generation(gen, mejor_ruta, mejor_distancia): sus excepciones detienen la corrida.
+    Implementado sobre iter_genetico.
+    """
+    historial = Historial(historial_max, historial_cada)
+    historial_diversity = Historial(historial_max, historial_cada)
+    tiempos = Historial(historial_max, historial_cada)
+    mejor_ruta, mejor_distancia = None, float("inf")
+
+    corrida = iter_genetico(
+        ciudades, n_poblacion=n_poblacion, n_iter=n_iter, porc_elite=porc_elite,
+        porc_cruce=porc_cruce, prob_mut=prob_mut, selec_method=selec_method, torneo_k=torneo_k,
+        seed=seed, porc_mut=porc_mut, dist_matrix=dist_matrix, time_limit=time_limit, cancel=cancel,
+        crossover=crossover, control=control,
+    )
+    try:
+        for estado in corrida:
+            gen = estado["gen"]
+            mejor_ruta, mejor_distancia = estado["mejor_ruta"], estado["mejor_distancia"]
+            historial.append(gen, mejor_distancia)
+            historial_diversity.append(gen, estado["diversidad"])
+            tiempos.append(gen, estado["tiempo_gen"])
+            if on_generation is not None:
+                on_generation(gen, mejor_ruta, mejor_distancia)
+    finally:
+        corrida.close()
 
     if return_all:
-        return mejor_ruta, mejor_distancia, historial, historial_diversity, tiempos
-    return mejor_ruta, mejor_distancia, historial
+        return (mejor_ruta, mejor_distancia, list(historial), list(historial_diversity), list(tiempos),
+                list(historial.gens))
+    return mejor_ruta, mejor_distancia, list(historial)
 
 # =====================
 # PRUEBA RÁPIDA (si se ejecuta como script)
@@ -186,7 +657,7 @@ if __name__ == "__main__":
     np.random.seed(0)
     random.seed(0)
     ciudades = np.random.rand(20,2) * 100
-    best_route, best_dist, hist, div_hist, times = algoritmo_genetico(
+    best_route, best_dist, hist, div_hist, times, gens = algoritmo_genetico(
         ciudades,
         n_poblacion=100,
         n_iter=200,
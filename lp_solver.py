@@ -1,9 +1,107 @@
 # lp_solver.py
+import os
 import math
 import argparse
 from tsplib import leer_tsplib
+import re
 import time, pulp
-def construir_y_resolver_mtz_dist(dist_matrix, msg=False, time_limit_seconds=None):
+
+# Líneas del log de CBC con incumbente y/o cota
+_RE_INCUMBENTE = re.compile(r"Integer solution of ([-\d.eE+]+) found.*\(([\d.]+) seconds\)")
+_RE_NODOS = re.compile(r"After \d+ nodes, \d+ on tree, ([-\d.eE+]+) best solution, "
+                       r"best possible ([-\d.eE+]+) \(([\d.]+) seconds\)")
+# "Partial search - best objective X (best possible Y), took ... (T seconds)"
+_RE_PARCIAL = re.compile(r"Partial search - best objective ([-\d.eE+]+) \(best possible ([-\d.eE+]+)\)"
+                         r".*\(([\d.]+) seconds\)")
+# "Search completed - best objective X, took ... (T seconds)" (sin cota: se cierra con el resultado)
+_RE_COMPLETO = re.compile(r"Search completed - best objective ([-\d.eE+]+),.*\(([\d.]+) seconds\)")
+_RE_CONTINUO = re.compile(r"Continuous objective value is ([-\d.eE+]+) - ([\d.]+) seconds")
+_RE_RESULTADO = re.compile(r"^Result - (.+)$", re.M)
+_RE_COTA_FINAL = re.compile(r"^Lower bound:\s+([-\d.eE+]+)", re.M)
+SIN_SOLUCION = 1e50
+OPTIMO_CBC = "Optimal solution found"
+
+def progreso_cbc(log):
+    """
+    Extrae del log de CBC la evolución (tiempo_seg, incumbente, cota) y el resultado final.
+    incumbente/cota son None cuando CBC aún no los conoce. El último punto lleva la cota
+    final: igual al incumbente si CBC probó optimalidad, o el "Lower bound" del resumen
+    (p.ej. al parar por tiempo o por gap). Devuelve (progreso, resultado).
+    """
+    progreso = []
+    cota = None
+    for linea in log.splitlines():
+        m = _RE_CONTINUO.search(linea)
+        if m:
+            cota = float(m.group(1))
+            progreso.append((float(m.group(2)), None, cota))
+            continue
+        m = _RE_NODOS.search(linea) or _RE_PARCIAL.search(linea)
+        if m:
+            inc, cota, t = float(m.group(1)), float(m.group(2)), float(m.group(3))
+            progreso.append((t, None if inc >= SIN_SOLUCION else inc, cota))
+            continue
+        m = _RE_INCUMBENTE.search(linea)
+        if m:
+            progreso.append((float(m.group(2)), float(m.group(1)), cota))
+            continue
+        m = _RE_COMPLETO.search(linea)
+        if m:
+            inc = float(m.group(1))
+            progreso.append((float(m.group(2)), None if inc >= SIN_SOLUCION else inc, cota))
+    m = _RE_RESULTADO.search(log)
+    resultado = m.group(1).strip() if m else None
+
+    # cierre: cota final según el resultado
+    if progreso:
+        t, _, cota = progreso[-1]
+        incs = [i for _, i, _ in progreso if i is not None]
+        inc = incs[-1] if incs else None
+        m = _RE_COTA_FINAL.search(log)
+        if resultado == OPTIMO_CBC and inc is not None:
+            cota = inc
+        elif m and (cota is None or float(m.group(1)) > cota + 1e-3):
+            # el resumen viene redondeado a 3 decimales: solo se usa si mejora la cota
+            cota = float(m.group(1))
+        progreso[-1] = (t, progreso[-1][1], cota)
+    return progreso, resultado
+
+def _cierre(progreso):
+    # (incumbente, cota, gap) al final de la corrida
+    cota = progreso[-1][2] if progreso else None
+    incs = [inc for _, inc, _ in progreso if inc is not None]
+    inc = incs[-1] if incs else None
+    gap = (inc - cota) / abs(inc) if inc and cota is not None else None
+    return inc, cota, gap
+
+CBC_LOGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cbc_logs")
+
+def verificar_logs(carpeta=CBC_LOGS):
+    """
+    Chequeo de progreso_cbc sobre logs reales de CBC guardados en `carpeta`:
+    óptimo probado => cota == incumbente (gap 0); si no, cota <= incumbente.
+    """
+    for nombre in sorted(os.listdir(carpeta)):
+        with open(os.path.join(carpeta, nombre)) as f:
+            progreso, resultado = progreso_cbc(f.read())
+        inc, cota, gap = _cierre(progreso)
+        assert progreso and resultado, nombre
+        if resultado == OPTIMO_CBC:
+            assert inc is not None and cota == inc and gap == 0, (nombre, inc, cota, gap)
+        elif inc is not None:
+            assert cota is not None and cota <= inc and gap > 0, (nombre, inc, cota, gap)
+        else:
+            assert gap is None and cota is not None, (nombre, inc, cota, gap)
+        print(f"{nombre}: {resultado} | incumbente={inc} cota={cota} gap={gap}")
+
+def construir_y_resolver_mtz_dist(dist_matrix, msg=False, time_limit_seconds=None,
+                                  threads=None, gap_rel=None, log_path=None):
+    """
+    Modelo MTZ sobre dist_matrix resuelto con CBC.
+    threads / gap_rel se pasan a CBC. Si se da log_path, el log de CBC se guarda ahí y el
+    resultado incluye "progreso" [(tiempo_seg, incumbente, cota)], "incumbente", "cota",
+    "gap" y "resultado_cbc" (p.ej. "Stopped on time limit", que PuLP reporta como Optimal).
+    """
     n = dist_matrix.shape[0]
     prob = pulp.LpProblem("TSP_MTZ", pulp.LpMinimize)
     x = {(i,j): pulp.LpVariable(f"x_{i}_{j}", cat="Binary")
@@ -23,7 +121,8 @@ def construir_y_resolver_mtz_dist(dist_matrix, msg=False, time_limit_seconds=Non
             if i != j:
                 prob += u[i] - u[j] + (n-1) * x[(i,j)] <= n-2
 
-    solver = pulp.PULP_CBC_CMD(msg=msg, timeLimit=int(time_limit_seconds) if time_limit_seconds else None)
+    solver = pulp.PULP_CBC_CMD(msg=msg, timeLimit=int(time_limit_seconds) if time_limit_seconds else None,
+                               threads=threads, gapRel=gap_rel, logPath=log_path)
     t0 = time.time(); prob.solve(solver); t1 = time.time()
 
     status = pulp.LpStatus.get(prob.status, "Unknown")
@@ -44,15 +143,32 @@ def construir_y_resolver_mtz_dist(dist_matrix, msg=False, time_limit_seconds=Non
             if cur is None or cur in seen: break
         route = route[:n]
 
-    return {"status": status, "objective": obj, "route": route,
-            "n_vars": n_vars, "n_constraints": n_constraints, "time": t1 - t0}
+    res = {"status": status, "objective": obj, "route": route,
+           "n_vars": n_vars, "n_constraints": n_constraints, "time": t1 - t0}
+    if log_path:
+        try:
+            with open(log_path) as f:
+                progreso, resultado = progreso_cbc(f.read())
+        except OSError:
+            # CBC puede no llegar a escribir el log (p.ej. si falla al arrancar)
+            progreso, resultado = [], None
+        inc, cota, gap = _cierre(progreso)
+        res.update(progreso=progreso, cota=cota, incumbente=inc, resultado_cbc=resultado, gap=gap)
+    return res
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Resolver TSP por MTZ (PuLP).")
-    parser.add_argument("archivo", type=str, help="ruta al .tsp (TSPLIB) archivo")
+    parser.add_argument("archivo", type=str, nargs="?", help="ruta al .tsp (TSPLIB) archivo")
+    parser.add_argument("--verificar_logs", action="store_true",
+                        help="chequear el parser de logs CBC contra data/cbc_logs y salir")
     parser.add_argument("--time_limit", type=int, default=None, help="limite de tiempo en segundos para el solver (opcional)")
     parser.add_argument("--msg", action="store_true", help="mostrar mensajes del solver")
     args = parser.parse_args()
+    if args.verificar_logs:
+        verificar_logs()
+        raise SystemExit(0)
+    if not args.archivo:
+        parser.error("falta el archivo .tsp")
 
     ciudades = leer_tsplib(args.archivo)
     print("Instancia:", args.archivo, "n_ciudades:", len(ciudades))
@@ -1,28 +1,12 @@
 import argparse
+import json
 import os
+import sys
 import time
-import matplotlib.pyplot as plt
-
-from genetico import algoritmo_genetico
-
-# Import flexible del lector TSPLIB y la matriz de distancias
-from tsplib import leer_tsplib
-try:
-    from tsplib import build_distance_matrix  # si ya lo implementaste
-except ImportError:
-    build_distance_matrix = None
-
-# LP: intentar usar versión con dist_matrix, si no, la clásica
-LP_DIST_FN = None
-LP_PLAIN_FN = None
-try:
-    from lp_solver import construir_y_resolver_mtz_dist as LP_DIST_FN
-except ImportError:
-    pass
-try:
-    from lp_solver import construir_y_resolver_mtz as LP_PLAIN_FN
-except ImportError:
-    pass
+
+# Imports pesados (matplotlib, pulp, numpy vía genetico/tsplib) se difieren hasta que
+# la funcionalidad que los necesita se ejecuta: `--help`, el modo cliente y el
+# renderizado diferido no los pagan.
 
 
 def _load_instance(path):
@@ -31,6 +15,13 @@ def _load_instance(path):
       coords (Nx2), edge_type (str|None), dist_matrix (o None)
     Soporta tanto el nuevo leer_tsplib (dict) como el antiguo (np.ndarray).
     """
+    # Import flexible del lector TSPLIB y la matriz de distancias
+    from tsplib import leer_tsplib
+    try:
+        from tsplib import build_distance_matrix  # si ya lo implementaste
+    except ImportError:
+        build_distance_matrix = None
+
     ts = leer_tsplib(path)
     if isinstance(ts, dict):
         coords = ts.get("coords")
@@ -48,11 +39,14 @@ def _load_instance(path):
     return coords, edge_type, D
 
 
-def run_ga(coords, D, args):
+def run_ga(coords, D, args, control=None):
     """
     Ejecuta GA intentando primero con dist_matrix; si falla, cae a coords.
-    Devuelve: (mejor_ruta, mejor_dist, historial, diversity_or_None)
+    Devuelve: (mejor_ruta, mejor_dist, historial, diversity_or_None, elapsed, tiempos_or_None, gens_or_None)
+    gens: generación de cada punto del historial.
     """
+    from genetico import algoritmo_genetico
+
     ga_kwargs = dict(
         n_poblacion=args.n_poblacion,
         n_iter=args.n_iter,
@@ -63,6 +57,9 @@ def run_ga(coords, D, args):
         torneo_k=args.torneo_k,
         seed=args.seed,
         porc_mut=args.porc_mut,     # 👈 pasar al GA
+        crossover=args.crossover,
+        control=control,
+        time_limit=args.ga_time_limit,
     )
 
     # Intento 1: API nueva con dist_matrix + return_all
@@ -75,29 +72,42 @@ def run_ga(coords, D, args):
             **ga_kwargs,
         )
         elapsed = time.time() - start
-        if len(res) == 5:
-            mejor_ruta, mejor_dist, historial, diversidad, _ = res
+        if len(res) >= 5:
+            mejor_ruta, mejor_dist, historial, diversidad, tiempos = res[:5]
+            gens = res[5] if len(res) > 5 else None
         else:
             mejor_ruta, mejor_dist, historial = res
-            diversidad = None
-        return mejor_ruta, mejor_dist, historial, diversidad, elapsed
+            diversidad = tiempos = gens = None
+        return mejor_ruta, mejor_dist, historial, diversidad, elapsed, tiempos, gens
     except TypeError:
         # Intento 2: API antigua -> ahora también pedimos return_all=True
         start = time.time()
         res = algoritmo_genetico(coords, return_all=True, **ga_kwargs)  # 👈 aquí
         elapsed = time.time() - start
-        # compatibilidad: acepta 3 o 5 elementos
-        if isinstance(res, tuple) and len(res) == 5:
-            mejor_ruta, mejor_dist, historial, diversidad, _ = res
+        # compatibilidad: acepta 3, 5 o 6 elementos
+        gens = None
+        if isinstance(res, tuple) and len(res) >= 5:
+            mejor_ruta, mejor_dist, historial, diversidad, tiempos = res[:5]
+            gens = res[5] if len(res) > 5 else None
         elif isinstance(res, tuple) and len(res) >= 3:
             mejor_ruta, mejor_dist, historial = res[:3]
-            diversidad = None
+            diversidad = tiempos = None
         else:
-            mejor_ruta, mejor_dist, historial, diversidad = res, None, None, None
-        return mejor_ruta, mejor_dist, historial, diversidad, elapsed
+            mejor_ruta, mejor_dist, historial, diversidad, tiempos = res, None, None, None, None
+        return mejor_ruta, mejor_dist, historial, diversidad, elapsed, tiempos, gens
+
+
+def _pyplot(outpath):
+    # Sin pantalla (guardar a archivo) se fuerza Agg para no requerir un display
+    import matplotlib
+    if outpath and "matplotlib.pyplot" not in sys.modules:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
 
 def plot_route(coords, route, title, outpath=None):
+    plt = _pyplot(outpath)
     ruta_coords = [coords[i] for i in route] + [coords[route[0]]]
     plt.figure(figsize=(6, 6))
     plt.plot([c[0] for c in ruta_coords], [c[1] for c in ruta_coords], "-o")
@@ -110,9 +120,10 @@ def plot_route(coords, route, title, outpath=None):
         plt.show()
 
 
-def plot_series(values, title, xlabel, ylabel, outpath=None):
+def plot_series(values, title, xlabel, ylabel, outpath=None, xs=None):
+    plt = _pyplot(outpath)
     plt.figure()
-    plt.plot(values)
+    plt.plot(*([xs, values] if xs else [values]))
     plt.title(title)
     plt.xlabel(xlabel); plt.ylabel(ylabel)
     if outpath:
@@ -128,6 +139,18 @@ def run_lp(coords, D, args):
     Intenta resolver por LP usando dist_matrix; si no existe esa función,
     cae a la versión que reconstruye dist internamente con coords.
     """
+    # LP: intentar usar versión con dist_matrix, si no, la clásica
+    LP_DIST_FN = None
+    LP_PLAIN_FN = None
+    try:
+        from lp_solver import construir_y_resolver_mtz_dist as LP_DIST_FN
+    except ImportError:
+        pass
+    try:
+        from lp_solver import construir_y_resolver_mtz as LP_PLAIN_FN
+    except ImportError:
+        pass
+
     if LP_DIST_FN is not None and D is not None:
         res = LP_DIST_FN(D, msg=args.lp_msg, time_limit_seconds=args.time_limit)
     elif LP_PLAIN_FN is not None:
@@ -137,6 +160,83 @@ def run_lp(coords, D, args):
     return res
 
 
+def render_resultados(salida, results_dir=None):
+    """
+    Genera las gráficas (ruta, convergencia, diversidad) a partir del dict de resultados
+    que produce main (el mismo que se guarda con --json). Si results_dir es None se muestran.
+    """
+    instancia, coords = salida["instancia"], salida["coords"]
+
+    def out(nombre):
+        return os.path.join(results_dir, nombre) if results_dir else None
+
+    ga = salida.get("ga")
+    if ga:
+        if ga.get("ruta") is not None:
+            plot_route(coords, ga["ruta"], f"Mejor ruta GA - {instancia}", out(f"GA_{instancia}_ruta.png"))
+        if ga.get("historial") is not None:
+            plot_series(ga["historial"], f"Convergencia GA - {instancia}", "Iteración", "Distancia",
+                        out(f"GA_{instancia}_convergencia.png"), xs=ga.get("gens"))
+        if ga.get("diversidad") is not None:
+            plot_series(ga["diversidad"], f"Diversidad GA - {instancia}", "Iteración", "Diversidad",
+                        out(f"GA_{instancia}_diversidad.png"), xs=ga.get("gens"))
+
+    lp = salida.get("lp")
+    if lp and lp.get("ruta"):
+        plot_route(coords, lp["ruta"], f"Ruta LP MTZ - {instancia} ({lp['status']})", out(f"LP_{instancia}_ruta.png"))
+
+
+def _a_json(o):
+    # numpy -> tipos nativos
+    if hasattr(o, "tolist"):
+        return o.tolist()
+    if hasattr(o, "item"):
+        return o.item()
+    raise TypeError(f"No serializable: {type(o).__name__}")
+
+
+def run_cliente(args, log=print):
+    """
+    Modo cliente: delega la resolución a servicio.py (instancias y matrices ya cargadas)
+    e imprime los avances de la mejor ruta a medida que llegan. Devuelve el dict de resultados.
+    """
+    from servicio import cliente_resolver
+
+    instancia = args.instancia
+    salida = {"instancia": instancia}
+    metodos = ["ga", "lp"] if args.metodo == "ambos" else [args.metodo]
+    for metodo in metodos:
+        solicitud = {"instancia": instancia, "metodo": metodo, "coords": "coords" not in salida}
+        if metodo == "ga":
+            solicitud["params"] = dict(
+                n_poblacion=args.n_poblacion, n_iter=args.n_iter, porc_elite=args.porc_elite,
+                porc_cruce=args.porc_cruce, prob_mut=args.prob_mut, selec_method=args.selec_method,
+                torneo_k=args.torneo_k, seed=args.seed, porc_mut=args.porc_mut, crossover=args.crossover,
+                control=True if args.adaptativo else None,
+            )
+            solicitud["time_budget"] = args.ga_time_limit
+        else:
+            solicitud["time_budget"] = args.time_limit
+
+        def progreso(msg):
+            log(f"[{metodo.upper()}] gen {msg['gen']}: {msg['distancia']:.6f}  ({msg['tiempo']:.1f}s)")
+
+        res = cliente_resolver(args.servidor, solicitud, on_progreso=progreso)
+        if "coords" in res:
+            salida.update(coords=res["coords"], n_ciudades=len(res["coords"]), edge_type=res["edge_type"])
+        if metodo == "ga":
+            log(f"[GA] Mejor distancia: {res['distancia']:.6f}  | tiempo: {res['tiempo']:.2f}s")
+            salida["ga"] = {k: res.get(k) for k in ("ruta", "distancia", "tiempo", "historial", "diversidad", "tiempos", "gens")}
+            if res.get("control") is not None:
+                salida["ga"]["control"] = res["control"]
+        else:
+            log(f"[LP] Status: {res['status']} | Objetivo: {res['distancia']:.6f} | "
+                f"Tiempo: {res['tiempo']:.2f}s | Vars: {res['n_vars']} | Restricciones: {res['n_constraints']}")
+            salida["lp"] = {"status": res["status"], "objetivo": res["distancia"], "tiempo": res["tiempo"],
+                            "n_vars": res["n_vars"], "n_constraints": res["n_constraints"], "ruta": res["ruta"]}
+    return salida
+
+
 def main():
     parser = argparse.ArgumentParser(description="TSP Proyecto: GA / LP (MTZ)")
     parser.add_argument("--metodo", choices=["ga", "lp", "ambos"], default="ga")
@@ -144,6 +244,8 @@ def main():
     parser.add_argument("--base", default="data", help="Carpeta base de instancias .tsp")
     parser.add_argument("--time_limit", type=int, default=3600, help="Límite de tiempo LP (s)")
     parser.add_argument("--lp-msg", action="store_true", help="Mensajes del solver LP")
+    parser.add_argument("--ga_time_limit", type=float, default=None,
+                        help="Límite de tiempo GA (s); con --servidor se envía como time_budget")
     parser.add_argument("--porc_mut", type=float, default=None, help="fracción de población creada por mutación pura")
     # Hiperparámetros GA
     parser.add_argument("--n_poblacion", type=int, default=300)
@@ -154,55 +256,99 @@ def main():
     parser.add_argument("--selec_method", choices=["torneo", "ruleta"], default="torneo")
     parser.add_argument("--torneo_k", type=int, default=3)
     parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--crossover", choices=["ox", "erx", "eax", "adaptativo"], default="ox",
+                        help="Operador de cruce: orden (ox), edge recombination (erx), edge assembly (eax) "
+                             "o adaptativo (los tres, elegidos por éxito reciente)")
+    parser.add_argument("--adaptativo", action="store_true",
+                        help="Ajusta prob_mut, reparto cruce/mutación y torneo_k en cada generación")
 
     parser.add_argument("--save-results", action="store_true",
                         help="Si se especifica, guarda PNGs en results/ en lugar de mostrar")
+    parser.add_argument("--servidor", default=None,
+                        help="Resolver en un servicio.py ya iniciado (host:puerto o unix:/ruta.sock)")
+    parser.add_argument("--no-plots", action="store_true",
+                        help="No genera ni muestra gráficas (no importa matplotlib)")
+    parser.add_argument("--json", metavar="ARCHIVO", default=None,
+                        help="Escribe ruta, distancia, tiempos e historial en JSON ('-' = stdout). "
+                             "Implica --no-plots salvo que se use --save-results")
+    parser.add_argument("--render", metavar="ARCHIVO", default=None,
+                        help="Genera los PNG en results/ desde un JSON guardado con --json y termina")
     args = parser.parse_args()
 
-    instancia = args.instancia
-    archivo = os.path.join(args.base, f"{instancia}.tsp")
+    results_dir = "results"
 
-    # Cargar instancia
-    coords, edge_type, D = _load_instance(archivo)
+    if args.render:
+        with open(args.render) as f:
+            render_resultados(json.load(f), results_dir)
+        print("PNGs generados en", results_dir)
+        return
 
-    print(f"Instancia: {instancia}")
-    print(f"Número de ciudades: {len(coords)}")
-    print(f"EDGE_WEIGHT_TYPE: {edge_type}")
-    print(f"Distancia: {'matriz GEO/EUC_2D OK' if D is not None else 'SIN matriz (modo coords)'}")
+    # Con JSON a stdout, los mensajes de progreso van a stderr
+    log = (lambda *a: print(*a, file=sys.stderr)) if args.json == "-" else print
+    graficar = not args.no_plots and (args.save_results or args.json is None)
+    t_inicio = time.time()
 
-    results_dir = "results"
-    os.makedirs(results_dir, exist_ok=True)
-
-    # GA
-    if args.metodo in ("ga", "ambos"):
-        mejor_ruta, mejor_dist, historial, diversidad, t_ga = run_ga(coords, D, args)
-        print(f"[GA] Mejor distancia: {mejor_dist:.6f}  | tiempo: {t_ga:.2f}s")
-
-        # Graficar
-        if mejor_ruta is not None:
-            title = f"Mejor ruta GA - {instancia}"
-            out = os.path.join(results_dir, f"GA_{instancia}_ruta.png") if args.save_results else None
-            plot_route(coords, mejor_ruta, title, out)
-
-        if historial is not None:
-            title = f"Convergencia GA - {instancia}"
-            out = os.path.join(results_dir, f"GA_{instancia}_convergencia.png") if args.save_results else None
-            plot_series(historial, title, "Iteración", "Distancia", out)
-
-        if diversidad is not None:
-            title = f"Diversidad GA - {instancia}"
-            out = os.path.join(results_dir, f"GA_{instancia}_diversidad.png") if args.save_results else None
-            plot_series(diversidad, title, "Iteración", "Diversidad", out)
-
-    # LP
-    if args.metodo in ("lp", "ambos"):
-        res = run_lp(coords, D, args)
-        print(f"[LP] Status: {res['status']} | Objetivo: {res['objective']:.6f} | "
-              f"Tiempo: {res['time']:.2f}s | Vars: {res['n_vars']} | Restricciones: {res['n_constraints']}")
-        if res.get("route"):
-            title = f"Ruta LP MTZ - {instancia} ({res['status']})"
-            out = os.path.join(results_dir, f"LP_{instancia}_ruta.png") if args.save_results else None
-            plot_route(coords, res["route"], title, out)
+    if args.servidor:
+        salida = run_cliente(args, log)
+    else:
+        instancia = args.instancia
+        archivo = os.path.join(args.base, f"{instancia}.tsp")
+
+        # Cargar instancia
+        coords, edge_type, D = _load_instance(archivo)
+        t_carga = time.time() - t_inicio
+
+        log(f"Instancia: {instancia}")
+        log(f"Número de ciudades: {len(coords)}")
+        log(f"EDGE_WEIGHT_TYPE: {edge_type}")
+        log(f"Distancia: {'matriz GEO/EUC_2D OK' if D is not None else 'SIN matriz (modo coords)'}")
+
+        salida = {"instancia": instancia, "n_ciudades": len(coords), "edge_type": edge_type,
+                  "coords": coords, "tiempos": {"carga": t_carga}}
+
+        # GA
+        if args.metodo in ("ga", "ambos"):
+            control = None
+            if args.adaptativo or args.crossover == "adaptativo":
+                from genetico import ControlAdaptativo
+                # --crossover adaptativo solo sin --adaptativo: bandido de operadores, tasas fijas
+                control = ControlAdaptativo(adaptar_tasas=args.adaptativo)
+            mejor_ruta, mejor_dist, historial, diversidad, t_ga, tiempos, gens = run_ga(coords, D, args, control)
+            log(f"[GA] Mejor distancia: {mejor_dist:.6f}  | tiempo: {t_ga:.2f}s")
+            salida["ga"] = {"ruta": mejor_ruta, "distancia": mejor_dist, "tiempo": t_ga,
+                            "historial": historial, "diversidad": diversidad, "tiempos": tiempos,
+                            "gens": gens}
+            if control is not None:
+                fin = control.trayectoria[-1] if control.trayectoria else {}
+                log(f"[GA] Control final: prob_mut={fin.get('prob_mut', 0):.3f} porc_mut={fin.get('porc_mut', 0):.3f} "
+                    f"torneo_k={fin.get('torneo_k')} pesos={fin.get('pesos_cruce')}")
+                salida["ga"]["control"] = control.trayectoria
+
+        # LP
+        if args.metodo in ("lp", "ambos"):
+            res = run_lp(coords, D, args)
+            log(f"[LP] Status: {res['status']} | Objetivo: {res['objective']:.6f} | "
+                f"Tiempo: {res['time']:.2f}s | Vars: {res['n_vars']} | Restricciones: {res['n_constraints']}")
+            salida["lp"] = {"status": res["status"], "objetivo": res["objective"], "tiempo": res["time"],
+                            "n_vars": res["n_vars"], "n_constraints": res["n_constraints"], "ruta": res.get("route")}
+
+    salida.setdefault("tiempos", {})["total"] = time.time() - t_inicio
+
+    if args.json == "-":
+        json.dump(salida, sys.stdout, default=_a_json)
+        sys.stdout.write("\n")
+    elif args.json:
+        d = os.path.dirname(args.json)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(salida, f, default=_a_json)
+        log("Resultados JSON ->", args.json)
+
+    if graficar and "coords" in salida:
+        if args.save_results:
+            os.makedirs(results_dir, exist_ok=True)
+        render_resultados(salida, results_dir if args.save_results else None)
 
 
 if __name__ == "__main__":
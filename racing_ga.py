@@ -0,0 +1,225 @@
+# racing_ga.py
+import os
+import math
+import time
+import random
+import argparse
+import itertools
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from genetico import algoritmo_genetico
+from tsplib import leer_tsplib, build_distance_matrix
+from resultados_db import conectar, registrar_corrida_ga
+
+INSTANCIAS = {
+    "eil101": "data/eil101.tsp",
+    "gr229": "data/gr229.tsp",
+    "inventado": "data/inventado.tsp",
+}
+
+# Espacio de búsqueda por defecto (valores discretos por hiperparámetro)
+ESPACIO = {
+    "n_poblacion": [100, 200, 300, 500],
+    "porc_cruce":  [0.5, 0.6, 0.68, 0.8],
+    "porc_mut":    [0.1, 0.2, 0.3],
+    "prob_mut":    [0.05, 0.1, 0.2, 0.4],
+    "torneo_k":    [2, 3, 5, 8],
+}
+
+# Parámetros que no se exploran
+BASE = dict(porc_elite=0.02, selec_method="torneo")
+
+# =====================
+# CONFIGURACIONES
+# =====================
+
+def muestrear_configs(espacio, n_configs=None, seed=None):
+    """
+    Devuelve una lista de dicts. Si n_configs es None (o ≥ tamaño de la grilla)
+    se devuelve la grilla completa; si no, una muestra sin reemplazo.
+    """
+    claves = sorted(espacio)
+    total = math.prod(len(espacio[k]) for k in claves)
+    rng = random.Random(seed)
+    if n_configs is None or n_configs >= total:
+        combos = itertools.product(*(espacio[k] for k in claves))
+        return [dict(zip(claves, c)) for c in combos]
+    idxs = rng.sample(range(total), n_configs)
+    configs = []
+    for idx in idxs:
+        cfg = {}
+        for k in reversed(claves):
+            vals = espacio[k]
+            idx, r = divmod(idx, len(vals))
+            cfg[k] = vals[r]
+        configs.append(dict(sorted(cfg.items())))
+    return configs
+
+
+# =====================
+# EVALUACIÓN (en procesos)
+# =====================
+
+_CACHE_D = {}
+
+def _matriz(archivo):
+    # cada proceso construye la matriz una sola vez por instancia
+    if archivo not in _CACHE_D:
+        _CACHE_D[archivo] = build_distance_matrix(leer_tsplib(archivo))
+    return _CACHE_D[archivo]
+
+def _evaluar(tarea):
+    idx, archivo, params, seed = tarea
+    D = _matriz(archivo)
+    t0 = time.time()
+    ruta, dist, hist, div, tps, gens = algoritmo_genetico(
+        ciudades=None, dist_matrix=D, return_all=True, seed=seed, **params
+    )
+    return idx, seed, params, ruta, dist, time.time() - t0, hist, div, tps, gens
+
+
+# =====================
+# ELIMINACIÓN
+# =====================
+
+MIN_SEEDS_TEST = 3   # con menos semillas (df < 2) el test pareado no se aplica
+
+def _t_cdf(t, df):
+    """CDF de la t de Student para df entero (series cerradas, Abramowitz & Stegun 26.7.3-4)."""
+    th = math.atan(abs(t) / math.sqrt(df))
+    c2 = math.cos(th) ** 2
+    if df % 2 == 0:
+        suma, term = 1.0, 1.0
+        for k in range(2, df - 1, 2):
+            term *= c2 * (k - 1) / k
+            suma += term
+        a = math.sin(th) * suma
+    else:
+        suma, term = 0.0, 1.0
+        if df > 1:
+            suma = 1.0
+            for k in range(3, df - 1, 2):
+                term *= c2 * (k - 1) / k
+                suma += term
+        a = 2 / math.pi * (th + math.sin(th) * math.cos(th) * suma)
+    return 0.5 + a / 2 if t >= 0 else 0.5 - a / 2
+
+
+def _peores_estadisticamente(scores, alpha):
+    """
+    Test t pareado (por semilla, df = n-1) de cada config contra la de mejor media,
+    con corrección de Holm por las comparaciones múltiples. Solo se aplica con al
+    menos MIN_SEEDS_TEST semillas. scores: {idx: [dist por seed]}.
+    """
+    medias = {i: statistics.fmean(v) for i, v in scores.items()}
+    mejor = min(medias, key=medias.get)
+    pvals = {}
+    for i, v in scores.items():
+        if i == mejor or len(v) < MIN_SEEDS_TEST:
+            continue
+        diffs = [a - b for a, b in zip(v, scores[mejor])]
+        sd = statistics.stdev(diffs)
+        if sd == 0:
+            continue   # sin varianza no hay evidencia que medir
+        t = statistics.fmean(diffs) / (sd / math.sqrt(len(diffs)))
+        pvals[i] = 1 - _t_cdf(t, len(diffs) - 1)
+    # Holm: se rechaza en orden creciente de p mientras p_(j) <= alpha / (m - j)
+    peores = set()
+    m = len(pvals)
+    for j, (i, p) in enumerate(sorted(pvals.items(), key=lambda kv: kv[1])):
+        if p > alpha / (m - j):
+            break
+        peores.add(i)
+    return peores
+
+
+def racing(
+    instancia,
+    espacio=ESPACIO,
+    n_configs=64,
+    min_gens=50,
+    max_gens=1000,
+    eta=3,
+    min_seeds=MIN_SEEDS_TEST,
+    max_seeds=10,
+    alpha=0.05,
+    workers=None,
+    seed=0,
+    db_path=None,
+):
+    """
+    Successive halving con racing: todas las configs arrancan con pocas generaciones
+    y pocas semillas; en cada ronda se eliminan las estadísticamente peores y, de las
+    que quedan, pasan como mucho ceil(n/eta) (las de mejor media). Las sobrevivientes
+    pasan a un presupuesto eta veces mayor (generaciones y semillas, con tope en
+    max_gens / max_seeds).
+
+    Todas las corridas se guardan en la base de resultados (origen="racing").
+    Devuelve (mejor_config, rondas) donde rondas es una lista de dicts por ronda.
+    """
+    archivo = INSTANCIAS.get(instancia, instancia)
+    configs = muestrear_configs(espacio, n_configs, seed=seed)
+    vivos = list(range(len(configs)))
+    db = conectar(db_path) if db_path else conectar()
+    rondas = []
+
+    gens, n_seeds = min_gens, min_seeds
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            seeds = list(range(1, n_seeds + 1))
+            tareas = [(i, archivo, dict(BASE, n_iter=gens, **configs[i]), s) for i in vivos for s in seeds]
+            scores = {i: [None] * len(seeds) for i in vivos}
+            t0 = time.time()
+            for idx, s, params, ruta, dist, tiempo, hist, div, tps, gens in pool.map(_evaluar, tareas):
+                scores[idx][s - 1] = dist
+                registrar_corrida_ga(db, instancia, params, s, None, dist, tiempo,
+                                     ruta=ruta, historial=hist, diversidad=div, tiempos=tps, origen="racing",
+                                     gens=gens)
+
+            medias = {i: statistics.fmean(v) for i, v in scores.items()}
+            orden = sorted(vivos, key=medias.get)
+            peores = _peores_estadisticamente(scores, alpha)
+            cupo = max(1, math.ceil(len(vivos) / eta))
+            # la de mejor media nunca está en `peores`: siempre sobrevive al menos una
+            sobreviven = [i for i in orden if i not in peores][:cupo]
+
+            rondas.append({
+                "n_iter": gens, "n_seeds": n_seeds, "n_configs": len(vivos),
+                "eliminadas_test": len(peores), "sobreviven": len(sobreviven),
+                "mejor": configs[orden[0]], "mejor_media": medias[orden[0]],
+                "tiempo_seg": time.time() - t0,
+            })
+            print(f"[racing] gens={gens} seeds={n_seeds} configs={len(vivos)} -> {len(sobreviven)} "
+                  f"| mejor media={medias[orden[0]]:.2f} | {time.time() - t0:.1f}s")
+
+            vivos = sobreviven
+            if len(vivos) == 1 or (gens >= max_gens and n_seeds >= max_seeds):
+                break
+            gens = min(max_gens, gens * eta)
+            n_seeds = min(max_seeds, n_seeds * eta)
+
+    db.close()
+    return configs[vivos[0]], rondas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Racing / successive halving de hiperparámetros GA")
+    parser.add_argument("--instancia", default="eil101", help="nombre en INSTANCIAS o ruta a .tsp")
+    parser.add_argument("--n_configs", type=int, default=64)
+    parser.add_argument("--min_gens", type=int, default=50)
+    parser.add_argument("--max_gens", type=int, default=1000)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--min_seeds", type=int, default=MIN_SEEDS_TEST)
+    parser.add_argument("--max_seeds", type=int, default=10)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mejor, rondas = racing(
+        args.instancia, n_configs=args.n_configs, min_gens=args.min_gens, max_gens=args.max_gens,
+        eta=args.eta, min_seeds=args.min_seeds, max_seeds=args.max_seeds, alpha=args.alpha,
+        workers=args.workers, seed=args.seed,
+    )
+    print("Mejor configuración:", mejor)
@@ -0,0 +1,336 @@
+# resultados_db.py
+import os
+import json
+import time
+import sqlite3
+
+RESULTS_DIR = "results"
+DB_PATH = os.path.join(RESULTS_DIR, "resultados.db")
+
+# Campos de PARAMS que se guardan como columnas; el resto va a `extra` (JSON)
+PARAM_COLS = ["n_poblacion", "n_iter", "porc_elite", "porc_cruce", "porc_mut",
+              "prob_mut", "selec_method", "torneo_k"]
+
+# =====================
+# ESQUEMA
+# =====================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parametros (
+    id           INTEGER PRIMARY KEY,
+    clave        TEXT NOT NULL UNIQUE,
+    n_poblacion  INTEGER,
+    n_iter       INTEGER,
+    porc_elite   REAL,
+    porc_cruce   REAL,
+    porc_mut     REAL,
+    prob_mut     REAL,
+    selec_method TEXT,
+    torneo_k     INTEGER,
+    extra        TEXT
+);
+
+CREATE TABLE IF NOT EXISTS corridas (
+    id              INTEGER PRIMARY KEY,
+    instancia       TEXT NOT NULL,
+    parametros_id   INTEGER NOT NULL REFERENCES parametros(id),
+    seed            INTEGER,
+    run             INTEGER,
+    mejor_distancia REAL,
+    tiempo_seg      REAL,
+    ruta            TEXT,
+    origen          TEXT,
+    creado          REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_corridas_inst_params_seed
+    ON corridas(instancia, parametros_id, seed);
+CREATE INDEX IF NOT EXISTS idx_corridas_inst_dist
+    ON corridas(instancia, mejor_distancia);
+
+CREATE TABLE IF NOT EXISTS historiales (
+    corrida_id      INTEGER NOT NULL REFERENCES corridas(id),
+    gen             INTEGER NOT NULL,
+    mejor_distancia REAL,
+    diversidad      REAL,
+    tiempo_seg      REAL,
+    PRIMARY KEY (corrida_id, gen)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS lp_solves (
+    id            INTEGER PRIMARY KEY,
+    instancia     TEXT NOT NULL,
+    status        TEXT,
+    objetivo      REAL,
+    tiempo_seg    REAL,
+    n_vars        INTEGER,
+    n_constraints INTEGER,
+    time_limit    REAL,
+    ruta          TEXT,
+    creado        REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lp_inst_obj
+    ON lp_solves(instancia, objetivo);
+
+CREATE TABLE IF NOT EXISTS lp_progreso (
+    lp_id      INTEGER NOT NULL REFERENCES lp_solves(id),
+    tiempo_seg REAL NOT NULL,
+    incumbente REAL,
+    cota       REAL
+);
+CREATE INDEX IF NOT EXISTS idx_lp_progreso ON lp_progreso(lp_id, tiempo_seg);
+"""
+
+# Columnas agregadas después de la primera versión del esquema: (tabla, columna, tipo)
+MIGRACIONES = [
+    ("lp_solves", "incumbente", "REAL"),
+    ("lp_solves", "cota", "REAL"),
+    ("lp_solves", "gap", "REAL"),
+    ("lp_solves", "resultado_cbc", "TEXT"),
+    ("lp_solves", "threads", "INTEGER"),
+    ("lp_solves", "gap_rel", "REAL"),
+]
+
+
+def conectar(path=DB_PATH):
+    """
+    Abre (o crea) la base de resultados y asegura el esquema.
+    WAL permite que varios procesos escriban corridas sin bloquear las lecturas.
+    """
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    con = sqlite3.connect(path, timeout=60)
+    con.row_factory = sqlite3.Row
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA foreign_keys=ON")
+    con.executescript(SCHEMA)
+    _migrar(con)
+    return con
+
+
+def _migrar(con):
+    # agrega columnas nuevas a bases creadas con esquemas anteriores
+    for tabla, col, tipo in MIGRACIONES:
+        cols = {r[1] for r in con.execute(f"PRAGMA table_info({tabla})")}
+        if col not in cols:
+            con.execute(f"ALTER TABLE {tabla} ADD COLUMN {col} {tipo}")
+    con.commit()
+
+
+# =====================
+# ESCRITURA (append-only)
+# =====================
+
+def _param_id(con, params):
+    """Devuelve el id del conjunto de parámetros, insertándolo si es nuevo."""
+    params = dict(params)
+    clave = json.dumps(params, sort_keys=True, default=str)
+    row = con.execute("SELECT id FROM parametros WHERE clave = ?", (clave,)).fetchone()
+    if row is not None:
+        return row[0]
+    extra = {k: v for k, v in params.items() if k not in PARAM_COLS}
+    cur = con.execute(
+        f"INSERT INTO parametros (clave, {', '.join(PARAM_COLS)}, extra) "
+        f"VALUES (?, {', '.join('?' * len(PARAM_COLS))}, ?)",
+        [clave] + [params.get(c) for c in PARAM_COLS] + [json.dumps(extra, sort_keys=True, default=str) if extra else None],
+    )
+    return cur.lastrowid
+
+
+def registrar_corrida_ga(con, instancia, params, seed, run, mejor_distancia, tiempo_seg,
+                         ruta=None, historial=None, diversidad=None, tiempos=None, origen="experimento_ga",
+                         gens=None):
+    """
+    Inserta una corrida de GA (y su historial por generación, si se pasa). `gens` es la
+    generación de cada punto del historial (p.ej. si se diezmó); si no, se usa el índice.
+    Nunca sobreescribe corridas anteriores. Devuelve el id de la corrida.
+    """
+    with con:
+        pid = _param_id(con, params)
+        cur = con.execute(
+            "INSERT INTO corridas (instancia, parametros_id, seed, run, mejor_distancia, tiempo_seg, ruta, origen, creado) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (instancia, pid, seed, run,
+             None if mejor_distancia is None else float(mejor_distancia), float(tiempo_seg),
+             json.dumps([int(c) for c in ruta]) if ruta is not None else None,
+             origen, time.time()),
+        )
+        corrida_id = cur.lastrowid
+        if historial is not None:
+            n = len(historial)
+            div = list(diversidad) if diversidad is not None else [None] * n
+            tps = list(tiempos) if tiempos is not None else [None] * n
+            gen = list(gens) if gens is not None else range(n)
+            con.executemany(
+                "INSERT INTO historiales (corrida_id, gen, mejor_distancia, diversidad, tiempo_seg) VALUES (?, ?, ?, ?, ?)",
+                ((corrida_id, int(gen[i]), float(historial[i]),
+                  None if i >= len(div) or div[i] is None else float(div[i]),
+                  None if i >= len(tps) or tps[i] is None else float(tps[i]))
+                 for i in range(n)),
+            )
+    return corrida_id
+
+
+def registrar_lp(con, instancia, res, time_limit=None, threads=None, gap_rel=None):
+    """
+    Inserta el resultado de construir_y_resolver_mtz_dist (y su progreso
+    incumbente/cota, si viene). Devuelve el id.
+    """
+    with con:
+        cur = con.execute(
+            "INSERT INTO lp_solves (instancia, status, objetivo, tiempo_seg, n_vars, n_constraints, time_limit, ruta, creado, "
+            "incumbente, cota, gap, resultado_cbc, threads, gap_rel) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (instancia, res.get("status"),
+             None if res.get("objective") is None else float(res["objective"]),
+             res.get("time"), res.get("n_vars"), res.get("n_constraints"), time_limit,
+             json.dumps([int(c) for c in res["route"]]) if res.get("route") else None,
+             time.time(), res.get("incumbente"), res.get("cota"), res.get("gap"), res.get("resultado_cbc"), threads, gap_rel),
+        )
+        lp_id = cur.lastrowid
+        if res.get("progreso"):
+            con.executemany(
+                "INSERT INTO lp_progreso (lp_id, tiempo_seg, incumbente, cota) VALUES (?, ?, ?, ?)",
+                ((lp_id, t, inc, cota) for t, inc, cota in res["progreso"]),
+            )
+    return lp_id
+
+
+def importar_csv(con, ga_csv=None, lp_csv=None):
+    """
+    Carga CSVs antiguos (ga_resultados.csv / lp_resultados.csv) en la base.
+    Útil para migrar resultados previos; cada llamada agrega filas nuevas.
+    """
+    import csv
+    n_ga = n_lp = 0
+    if ga_csv and os.path.exists(ga_csv):
+        with open(ga_csv, newline="") as f:
+            for r in csv.DictReader(f):
+                params = {k: r.get(k) for k in PARAM_COLS if r.get(k) not in (None, "")}
+                for k in ("n_poblacion", "n_iter", "torneo_k"):
+                    if k in params:
+                        params[k] = int(float(params[k]))
+                for k in ("porc_elite", "porc_cruce", "porc_mut", "prob_mut"):
+                    if k in params:
+                        params[k] = float(params[k])
+                registrar_corrida_ga(
+                    con, r["instancia"], params,
+                    int(r["seed"]) if r.get("seed") else None,
+                    int(r["run"]) if r.get("run") else None,
+                    float(r["mejor_distancia"]), float(r["tiempo_seg"]),
+                    origen="csv",
+                )
+                n_ga += 1
+    if lp_csv and os.path.exists(lp_csv):
+        with open(lp_csv, newline="") as f:
+            for r in csv.DictReader(f):
+                registrar_lp(con, r["instancia"], {
+                    "status": r.get("status"),
+                    "objective": float(r["objetivo"]) if r.get("objetivo") else None,
+                    "time": float(r["tiempo_seg"]) if r.get("tiempo_seg") else None,
+                    "n_vars": int(float(r["n_vars"])) if r.get("n_vars") else None,
+                    "n_constraints": int(float(r["n_constraints"])) if r.get("n_constraints") else None,
+                })
+                n_lp += 1
+    return n_ga, n_lp
+
+
+# =====================
+# CONSULTAS
+# =====================
+
+# Corridas que cuentan para el informe: las de racing (origen="racing") son cortas
+# (pocas generaciones) y sesgarían tiempos y top-k.
+ORIGENES_INFORME = ("experimento_ga", "csv")
+
+def _filtro_origen(columna, origenes):
+    # (fragmento SQL, parámetros); origenes=None no filtra
+    if origenes is None:
+        return "", ()
+    return f" AND {columna} IN ({', '.join('?' * len(origenes))})", tuple(origenes)
+
+
+def top_k_ga(con, k=3, origenes=ORIGENES_INFORME):
+    """
+    Las k mejores corridas de GA por instancia, con gap % contra el mejor LP
+    (ROW_NUMBER usa el índice (instancia, mejor_distancia)).
+    Solo corridas con origen en `origenes` (None = todas).
+    """
+    filtro, params = _filtro_origen("c.origen", origenes)
+    return con.execute(f"""
+        WITH lp AS (
+            SELECT instancia, MIN(objetivo) AS objetivo
+            FROM lp_solves WHERE objetivo IS NOT NULL AND status = 'Optimal'
+            GROUP BY instancia
+        ),
+        rk AS (
+            SELECT c.*, ROW_NUMBER() OVER (PARTITION BY c.instancia ORDER BY c.mejor_distancia) AS rank
+            FROM corridas c WHERE c.mejor_distancia IS NOT NULL{filtro}
+        )
+        SELECT rk.instancia, rk.rank, rk.id AS corrida_id, rk.seed, rk.run,
+               rk.mejor_distancia, rk.tiempo_seg, p.n_poblacion, p.n_iter,
+               CASE WHEN lp.objetivo IS NULL OR lp.objetivo = 0 THEN NULL
+                    ELSE 100.0 * (rk.mejor_distancia - lp.objetivo) / lp.objetivo END AS gap_pct_vs_LP
+        FROM rk
+        JOIN parametros p ON p.id = rk.parametros_id
+        LEFT JOIN lp ON lp.instancia = rk.instancia
+        WHERE rk.rank <= ?
+        ORDER BY rk.instancia, rk.rank
+    """, params + (k,)).fetchall()
+
+
+def mejor_lp(con):
+    """Mejor solve LP (menor objetivo) por instancia."""
+    return con.execute("""
+        SELECT instancia, status, objetivo, tiempo_seg, n_vars, n_constraints FROM (
+            SELECT l.*, ROW_NUMBER() OVER (PARTITION BY instancia ORDER BY objetivo) AS rank
+            FROM lp_solves l WHERE objetivo IS NOT NULL AND status = 'Optimal'
+        ) WHERE rank = 1
+        ORDER BY instancia
+    """).fetchall()
+
+
+def resumen_tiempos(con, origenes=ORIGENES_INFORME):
+    """
+    Tiempo promedio/mín/máx de GA y tiempo del mejor LP por instancia.
+    Solo corridas con origen en `origenes` (None = todas).
+    """
+    filtro, params = _filtro_origen("origen", origenes)
+    return con.execute(f"""
+        WITH ga AS (
+            SELECT instancia, COUNT(*) AS n_runs, AVG(tiempo_seg) AS tiempo_ga_prom,
+                   MIN(tiempo_seg) AS tiempo_ga_min, MAX(tiempo_seg) AS tiempo_ga_max
+            FROM corridas WHERE 1 = 1{filtro} GROUP BY instancia
+        ),
+        lp AS (
+            SELECT instancia, tiempo_seg AS tiempo_lp FROM (
+                SELECT instancia, tiempo_seg,
+                       ROW_NUMBER() OVER (PARTITION BY instancia ORDER BY objetivo) AS rank
+                FROM lp_solves WHERE objetivo IS NOT NULL AND status = 'Optimal'
+            ) WHERE rank = 1
+        )
+        SELECT ga.*, lp.tiempo_lp
+        FROM ga LEFT JOIN lp ON lp.instancia = ga.instancia
+        ORDER BY ga.instancia
+    """, params).fetchall()
+
+
+def resumen_por_parametros(con, instancia):
+    """Estadísticos de distancia/tiempo agrupados por conjunto de parámetros."""
+    return con.execute("""
+        SELECT p.*, COUNT(*) AS n_runs,
+               MIN(c.mejor_distancia) AS mejor, AVG(c.mejor_distancia) AS promedio,
+               AVG(c.tiempo_seg) AS tiempo_prom
+        FROM corridas c JOIN parametros p ON p.id = c.parametros_id
+        WHERE c.instancia = ?
+        GROUP BY p.id
+        ORDER BY promedio
+    """, (instancia,)).fetchall()
+
+
+def historial(con, corrida_id):
+    """Historial por generación de una corrida: lista de (gen, mejor, diversidad, tiempo)."""
+    return con.execute(
+        "SELECT gen, mejor_distancia, diversidad, tiempo_seg FROM historiales WHERE corrida_id = ? ORDER BY gen",
+        (corrida_id,),
+    ).fetchall()
@@ -0,0 +1,287 @@
+# servicio.py
+"""
+Servicio local de resolución TSP (asyncio).
+
+Mantiene las instancias de data/ y sus matrices de distancias cargadas en un pool
+de procesos, acepta solicitudes GA/LP y devuelve avances de la mejor ruta a medida
+que el GA mejora. Protocolo: una línea JSON por mensaje.
+
+  cliente -> {"cmd": "solve", "instancia": "eil101", "metodo": "ga"|"lp",
+              "params": {...}, "time_budget": 30, "coords": false}
+  servidor -> {"tipo": "aceptado", "job": 1, "en_cola": 0}
+              {"tipo": "progreso", "gen": 10, "distancia": 912.3, "ruta": [...]}   (solo GA)
+              {"tipo": "resultado", ...}  |  {"tipo": "error", "mensaje": "..."}
+
+  otros comandos: {"cmd": "ping"}, {"cmd": "instancias"}
+
+Si el cliente se desconecta, su GA se cancela (TokenCancelacion) y libera el worker;
+el LP corre hasta su time_budget.
+
+Dirección: "host:puerto" (TCP) o "unix:/ruta/al.sock".
+"""
+import os
+import glob
+import json
+import time
+import queue
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+DIRECCION = "127.0.0.1:8765"
+BASE_DATOS = "data"
+MAX_COLA = 16
+INTERVALO_PROGRESO = 0.5   # segundos mínimos entre avances enviados
+
+# =====================
+# WORKERS (procesos)
+# =====================
+
+_INSTANCIAS = {}   # nombre -> (coords, edge_type, dist_matrix), por proceso
+
+def _cargar_instancias(base):
+    from tsplib import leer_tsplib, build_distance_matrix
+    out = {}
+    for archivo in sorted(glob.glob(os.path.join(base, "*.tsp"))):
+        nombre = os.path.splitext(os.path.basename(archivo))[0]
+        ts = leer_tsplib(archivo)
+        out[nombre] = (ts["coords"], (ts["edge_type"] or "EUC_2D").upper(), build_distance_matrix(ts))
+    return out
+
+def _init_worker(base):
+    # se ejecuta una vez por proceso: instancias y matrices quedan residentes
+    global _INSTANCIAS
+    _INSTANCIAS = _cargar_instancias(base)
+    import genetico, lp_solver  # noqa: F401  (precalentar imports pesados)
+
+def _resolver(job, cola, cancelar=None):
+    # cancelar: Event (Manager) que el servidor activa si el cliente se desconecta
+    try:
+        coords, edge_type, D = _INSTANCIAS[job["instancia"]]
+        metodo = job.get("metodo", "ga")
+        budget = job.get("time_budget")
+        t0 = time.time()
+        if metodo == "ga":
+            from genetico import algoritmo_genetico, ControlAdaptativo, TokenCancelacion
+            ultimo = {"dist": float("inf"), "t": 0.0}
+            params = dict(job.get("params", {}))
+            # controlador propio para poder devolver su trayectoria (igual que main.py local)
+            cruce = params.get("crossover", "ox")
+            if params.get("control") is True:
+                params["control"] = ControlAdaptativo()
+            elif params.get("control") is None and (cruce == "adaptativo" or isinstance(cruce, list) and len(cruce) > 1):
+                params["control"] = ControlAdaptativo(adaptar_tasas=False)
+            control = params.get("control")
+
+            def on_gen(gen, ruta, dist):
+                ahora = time.time()
+                if ruta is None or dist >= ultimo["dist"] or ahora - ultimo["t"] < INTERVALO_PROGRESO:
+                    return
+                ultimo.update(dist=dist, t=ahora)
+                cola.put({"tipo": "progreso", "gen": gen, "distancia": float(dist),
+                          "ruta": [int(c) for c in ruta], "tiempo": ahora - t0})
+
+            ruta, dist, hist, div, tps, gens = algoritmo_genetico(
+                ciudades=None, dist_matrix=D, return_all=True, on_generation=on_gen,
+                time_limit=budget, cancel=TokenCancelacion(cancelar) if cancelar is not None else None,
+                **params
+            )
+            res = {"tipo": "resultado", "metodo": "ga", "distancia": float(dist),
+                   "ruta": [int(c) for c in ruta], "historial": [float(h) for h in hist],
+                   "diversidad": [float(d) for d in div], "tiempos": [float(t) for t in tps],
+                   "gens": [int(g) for g in gens], "tiempo": time.time() - t0}
+            if control is not None:
+                res["control"] = control.trayectoria
+        elif metodo == "lp":
+            from lp_solver import construir_y_resolver_mtz_dist
+            r = construir_y_resolver_mtz_dist(D, msg=False, time_limit_seconds=budget)
+            res = {"tipo": "resultado", "metodo": "lp", "status": r["status"],
+                   "distancia": None if r["objective"] is None else float(r["objective"]),
+                   "ruta": [int(c) for c in r["route"]], "n_vars": r["n_vars"],
+                   "n_constraints": r["n_constraints"], "tiempo": r["time"]}
+        else:
+            raise ValueError(f"metodo desconocido: {metodo}")
+        res["instancia"] = job["instancia"]
+        res["edge_type"] = edge_type
+        if job.get("coords"):
+            res["coords"] = [[float(x), float(y)] for x, y in coords]
+        cola.put(res)
+    except Exception as e:
+        cola.put({"tipo": "error", "mensaje": f"{type(e).__name__}: {e}"})
+    finally:
+        cola.put(None)
+
+
+# =====================
+# SERVIDOR (asyncio)
+# =====================
+
+class Servidor:
+    def __init__(self, base=BASE_DATOS, workers=None, max_cola=MAX_COLA):
+        self.base = base
+        self.workers = workers or os.cpu_count() or 1
+        self.nombres = sorted(os.path.splitext(os.path.basename(p))[0]
+                              for p in glob.glob(os.path.join(base, "*.tsp")))
+        self.cola = asyncio.Queue(maxsize=max_cola)
+        self.manager = multiprocessing.Manager()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(base,))
+        self.n_jobs = 0
+
+    async def _enviar(self, writer, msg):
+        writer.write((json.dumps(msg) + "\n").encode())
+        await writer.drain()
+
+    async def _despachador(self):
+        # cada despachador ocupa un worker del pool a la vez
+        loop = asyncio.get_running_loop()
+        while True:
+            job, writer, listo, cancelar = await self.cola.get()
+            if cancelar.is_set():   # el cliente se fue mientras esperaba en la cola
+                listo.set()
+                self.cola.task_done()
+                continue
+            canal = self.manager.Queue()
+            fut = loop.run_in_executor(self.pool, _resolver, job, canal, cancelar)
+            try:
+                while True:
+                    try:
+                        msg = await loop.run_in_executor(None, canal.get, True, 0.5)
+                    except queue.Empty:
+                        if fut.done():
+                            break   # el worker murió sin enviar el cierre
+                        continue
+                    if msg is None:
+                        break
+                    try:
+                        await self._enviar(writer, msg)
+                    except (ConnectionError, RuntimeError):
+                        cancelar.set()   # cliente desconectado: el GA corta en la próxima generación
+                await asyncio.wait([fut])
+                exc = fut.exception() if fut.done() else None
+                if exc is not None:
+                    await self._enviar(writer, {"tipo": "error", "mensaje": f"{type(exc).__name__}: {exc}"})
+            except (ConnectionError, RuntimeError):
+                pass
+            finally:
+                listo.set()
+                self.cola.task_done()
+
+    async def _esperar(self, reader, listo, cancelar):
+        # espera el fin del job; si el cliente cierra la conexión antes, lo cancela
+        while not listo.is_set():
+            try:
+                await asyncio.wait_for(listo.wait(), INTERVALO_PROGRESO)
+            except asyncio.TimeoutError:
+                if reader.at_eof() and not cancelar.is_set():
+                    cancelar.set()
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    msg = json.loads(linea)
+                except json.JSONDecodeError:
+                    await self._enviar(writer, {"tipo": "error", "mensaje": "JSON inválido"})
+                    continue
+                cmd = msg.get("cmd")
+                if cmd == "ping":
+                    await self._enviar(writer, {"tipo": "pong"})
+                elif cmd == "instancias":
+                    await self._enviar(writer, {"tipo": "instancias", "instancias": self.nombres})
+                elif cmd == "solve":
+                    if msg.get("instancia") not in self.nombres:
+                        await self._enviar(writer, {"tipo": "error", "mensaje": f"instancia desconocida: {msg.get('instancia')}"})
+                        continue
+                    listo = asyncio.Event()
+                    cancelar = self.manager.Event()
+                    try:
+                        self.cola.put_nowait((msg, writer, listo, cancelar))
+                    except asyncio.QueueFull:
+                        await self._enviar(writer, {"tipo": "error", "mensaje": "cola llena, reintente más tarde"})
+                        continue
+                    self.n_jobs += 1
+                    await self._enviar(writer, {"tipo": "aceptado", "job": self.n_jobs, "en_cola": self.cola.qsize()})
+                    await self._esperar(reader, listo, cancelar)
+                else:
+                    await self._enviar(writer, {"tipo": "error", "mensaje": f"cmd desconocido: {cmd}"})
+        finally:
+            writer.close()
+
+    async def servir(self, direccion=DIRECCION):
+        # precalentar todos los workers antes de aceptar conexiones
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, time.sleep, 0.1) for _ in range(self.workers)))
+        despachadores = [asyncio.create_task(self._despachador()) for _ in range(self.workers)]
+        if direccion.startswith("unix:"):
+            path = direccion[len("unix:"):]
+            if os.path.exists(path):
+                os.remove(path)
+            server = await asyncio.start_unix_server(self._atender, path=path)
+        else:
+            host, port = direccion.rsplit(":", 1)
+            server = await asyncio.start_server(self._atender, host, int(port))
+        print(f"Servicio TSP escuchando en {direccion} | instancias: {', '.join(self.nombres)} | workers: {self.workers}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for d in despachadores:
+                d.cancel()
+            self.pool.shutdown(cancel_futures=True)
+            self.manager.shutdown()
+
+
+# =====================
+# CLIENTE (síncrono, sin dependencias)
+# =====================
+
+def _conectar(direccion):
+    if direccion.startswith("unix:"):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.connect(direccion[len("unix:"):])
+    else:
+        host, port = direccion.rsplit(":", 1)
+        s = socket.create_connection((host, int(port)))
+    return s
+
+def cliente_resolver(direccion, solicitud, on_progreso=None):
+    """
+    Envía una solicitud "solve" y bloquea hasta el resultado.
+    on_progreso(msg) se llama con cada mensaje de progreso.
+    Lanza RuntimeError si el servidor responde con error.
+    """
+    with _conectar(direccion) as s, s.makefile("rwb") as f:
+        f.write((json.dumps(dict(solicitud, cmd="solve")) + "\n").encode())
+        f.flush()
+        for linea in f:
+            msg = json.loads(linea)
+            tipo = msg.get("tipo")
+            if tipo == "error":
+                raise RuntimeError(msg.get("mensaje"))
+            if tipo == "progreso" and on_progreso is not None:
+                on_progreso(msg)
+            elif tipo == "resultado":
+                return msg
+    raise RuntimeError("conexión cerrada por el servidor sin resultado")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio local TSP (GA / LP) con instancias precargadas")
+    parser.add_argument("--direccion", default=DIRECCION, help="host:puerto o unix:/ruta.sock")
+    parser.add_argument("--base", default=BASE_DATOS, help="Carpeta de instancias .tsp a precargar")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max_cola", type=int, default=MAX_COLA, help="Solicitudes en espera antes de rechazar")
+    args = parser.parse_args()
+
+    async def _main():
+        await Servidor(args.base, args.workers, args.max_cola).servir(args.direccion)
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
@@ -12,7 +12,11 @@ def leer_tsplib(ruta_archivo: str):
     """
     Retorna dict con:
       name, edge_type ('EUC_2D'|'GEO'), coords (np.ndarray Nx2 en floats tal como vienen)
+    También acepta la forma binaria .npz que escribe generar_instancias.py.
     """
+    if ruta_archivo.endswith(".npz"):
+        with np.load(ruta_archivo) as z:
+            return {"name": str(z["name"]), "edge_type": str(z["edge_type"]), "coords": z["coords"]}
     name = None
     edge_type = None
     coords = []